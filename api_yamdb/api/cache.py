@@ -0,0 +1,174 @@
+import hashlib
+import json
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from api.replicas import get_replica, reads_own_writes
+
+VERSION_KEY = 'api-version:{}'
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def is_cache_shared():
+    """Whether a version bump is seen by every worker process."""
+    return settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES
+
+
+def new_version():
+    # The bump time serves as Last-Modified of everything built from it.
+    return f'{int(time.time())}-{uuid.uuid4().hex}'
+
+
+def get_versions(*resources):
+    """Return the current version token of every resource.
+
+    Tokens are random, so a token lost to cache eviction is replaced by
+    a new one instead of reusing an old value; its newer time keeps
+    Last-Modified correct as well.
+    """
+    keys = [VERSION_KEY.format(resource) for resource in resources]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, new_version(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def get_version_time(versions):
+    """Return the time of the latest bump among ``versions``."""
+    return max(int(version.split('-', 1)[0]) for version in versions)
+
+
+def bump_versions(*resources):
+    """Invalidate every cached response built from these resources."""
+    cache.set_many({
+        VERSION_KEY.format(resource): new_version()
+        for resource in resources
+    }, None)
+
+
+def get_auth_scope(request):
+    if not request.user.is_authenticated:
+        return 'anon'
+    return request.user.role
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.md5(
+        '|'.join(str(part) for part in parts).encode()).hexdigest())
+
+
+def get_response_key(request, versions):
+    key = '|'.join((
+        request.get_full_path(),
+        get_auth_scope(request),
+        *versions,
+    ))
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+class CachedResponseMixin:
+    """Serve GET responses from validators and a versioned cache.
+
+    ``cache_resources`` names the resources a response is built from.
+    The ETag and Last-Modified come from their version tokens alone, so
+    a conditional request is answered with ``304 Not Modified`` without
+    touching the database; otherwise the response is read from or
+    stored in the cache under the same tokens. Writes bump the tokens,
+    so stale entries are never read again and simply expire after
+    ``API_CACHE_TIMEOUT``. A request with ``Cache-Control: no-cache``
+    skips the lookup and refreshes the entry.
+
+    Validators and stored responses need a cache shared by every
+    worker: a bump in a process-local cache reaches neither the other
+    workers nor the management commands that write in processes of
+    their own, so old ETags would be answered with 304 forever. Without
+    one, responses carry no validators and are not stored.
+
+    A response read from a replica is not stored: the replica may lag
+    behind the writes the tokens already stand for. A client pinned to
+    the primary after its own write skips the lookup, so it never gets
+    an entry built elsewhere before the write.
+    """
+    cache_resources = ()
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if not self.cache_resources or not is_cache_shared():
+            return handler(request, *args, **kwargs)
+        versions = get_versions(*self.cache_resources)
+        key = get_response_key(request, versions)
+        etag = quote_etag(key)
+        last_modified = get_version_time(versions)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = self.get_stored_response(
+                handler, request, 'api-response:' + key, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            # HTTP dates have whole seconds: a bump later in the current
+            # second would not move Last-Modified.
+            if last_modified < int(time.time()):
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def get_stored_response(self, handler, request, key, *args, **kwargs):
+        if not settings.API_CACHE_ENABLED:
+            return handler(request, *args, **kwargs)
+        if ('no-cache' not in request.headers.get('Cache-Control', '')
+                and not reads_own_writes(request)):
+            data = cache.get(key)
+            if data is not None:
+                response = Response(data)
+                response['X-Cache'] = 'HIT'
+                return response
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200 and get_replica() is None:
+            cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class CachedListMixin(CachedResponseMixin):
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs)
+
+
+class CachedRetrieveMixin(CachedResponseMixin):
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs)
+
+
+class ContentETagRetrieveMixin:
+    """ETag a single object by its content, without Last-Modified.
+
+    The object is read on every request, so the ETag follows any write,
+    including queryset updates that bump no version; the 304 only saves
+    sending the body.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+        etag = make_etag(
+            request.get_full_path(), get_auth_scope(request),
+            json.dumps(response.data, cls=DjangoJSONEncoder))
+        response['ETag'] = etag
+        return get_conditional_response(
+            request, etag=etag, response=response)
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+from api.cache import is_cache_shared
+
+
+@register()
+def check_response_cache(app_configs, **kwargs):
+    if settings.API_CACHE_ENABLED and not is_cache_shared():
+        return [Warning(
+            'Кэш ответов API отключён: кэш в памяти процесса не общий '
+            'для воркеров, и сброс кэша не доходит до других процессов',
+            hint='Укажите CACHE_BACKEND, например FileBasedCache или Redis',
+            id='api.W001',
+        )]
+    return []
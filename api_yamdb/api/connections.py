@@ -0,0 +1,137 @@
+"""Persistent database connections.
+
+``CONN_MAX_AGE`` keeps connections open between requests. Django 3.2
+has no ``CONN_HEALTH_CHECKS``, so when a request starts, connections
+that have been idle for ``DB_HEALTH_CHECK_IDLE`` seconds are pinged and
+the ones closed by the server or a pooler are dropped; busy connections
+are reused without the extra round trip.
+
+``ConnectionLimitMiddleware`` caps how many requests of one worker
+process use the database at once and how many connections it keeps
+open between requests.
+
+Behind a transaction-level pooler (``DB_TRANSACTION_POOLER``)
+server-side cursors are disabled; ``iter_by_pk`` reads large querysets
+page by page instead, so exports keep a flat memory profile there too.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.dispatch import receiver
+from django.http import HttpResponse
+
+
+@receiver(request_started)
+def check_idle_connections(**kwargs):
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None or connection.in_atomic_block:
+            continue
+        idle_since = getattr(connection, 'idle_since', now)
+        if (now - idle_since >= settings.DB_HEALTH_CHECK_IDLE
+                and not connection.is_usable()):
+            connection.close()
+
+
+@receiver(request_finished)
+def mark_idle_connections(**kwargs):
+    now = time.monotonic()
+    for connection in connections.all():
+        connection.idle_since = now
+
+
+def close_connections():
+    for connection in connections.all():
+        connection.close()
+
+
+class ConnectionLimitMiddleware:
+    """Let at most ``DB_MAX_CONNECTIONS`` requests of the process run at
+    once, and only as many threads keep their connections open.
+
+    A request that waits longer than ``DB_CONNECTION_WAIT`` seconds is
+    answered with 503. A streaming response keeps its slot until it has
+    been sent.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.limit = settings.DB_MAX_CONNECTIONS
+        self.slots = threading.BoundedSemaphore(self.limit or 1)
+        self.owners = set()
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        if not self.limit:
+            return self.get_response(request)
+        if not self.slots.acquire(timeout=settings.DB_CONNECTION_WAIT):
+            response = HttpResponse(
+                'Сервер перегружен, повторите запрос позже', status=503)
+            response['Retry-After'] = '1'
+            return response
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            self.release()
+            raise
+        if not response.streaming:
+            self.release()
+            return response
+        # Streamed content is read from the database while it is sent:
+        # the slot is held until the server closes the response.
+        close = response.close
+
+        def close_and_release():
+            try:
+                close()
+            finally:
+                self.release()
+
+        response.close = close_and_release
+        return response
+
+    def release(self):
+        self.slots.release()
+        if not self.keeps_connections():
+            close_connections()
+
+    def keeps_connections(self):
+        thread = threading.get_ident()
+        with self.lock:
+            if thread not in self.owners and len(self.owners) < self.limit:
+                self.owners.add(thread)
+            return thread in self.owners
+
+
+def uses_server_side_cursors(queryset):
+    return not connections[queryset.db].settings_dict.get(
+        'DISABLE_SERVER_SIDE_CURSORS')
+
+
+def iter_by_pk(queryset, chunk_size):
+    """Yield the rows of ``queryset`` in primary key order.
+
+    With server-side cursors this is ``iterator()``; without them
+    ``iterator()`` would fetch the whole result at once, so rows are
+    read in pages that start after the last primary key seen. Rows of
+    ``values()`` must include ``id``, rows of ``values_list()`` must
+    start with it.
+    """
+    queryset = queryset.order_by('pk')
+    if uses_server_side_cursors(queryset):
+        yield from queryset.iterator(chunk_size=chunk_size)
+        return
+    page = list(queryset[:chunk_size])
+    while page:
+        yield from page
+        last = page[-1]
+        if isinstance(last, dict):
+            last = last['id']
+        elif isinstance(last, tuple):
+            last = last[0]
+        else:
+            last = last.pk
+        page = list(queryset.filter(pk__gt=last)[:chunk_size])
@@ -0,0 +1,159 @@
+"""Streaming dumps of titles, reviews and comments.
+
+Rows are read with ``iterator()`` (a server-side cursor on PostgreSQL;
+pages by id behind a transaction pooler, see ``api.connections``) in
+``EXPORT_CHUNK_SIZE`` batches and encoded batch by batch, so memory
+does not depend on the size of the table and the first bytes are sent
+as soon as the first batch is fetched.
+"""
+import csv
+import io
+import json
+from datetime import datetime, time
+from itertools import islice
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.serializers import ValidationError
+
+from api.connections import iter_by_pk
+from api.fast_serializers import TitleRowSerializer, datetime_formatter
+from reviews.models import Comment, Review, Title
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+class TitleExport:
+    fields = ('id', 'name', 'year', 'description', 'category', 'genre',
+              'rating')
+    updated_field = 'modified'
+
+    def get_queryset(self):
+        return Title.objects.with_rating().annotate(
+            category_slug=F('category__slug')
+        ).values('id', 'name', 'year', 'description', 'category_slug',
+                 'rating')
+
+    def to_rows(self, rows):
+        genres = TitleRowSerializer().get_genres(rows)
+        for row in rows:
+            yield (
+                row['id'], row['name'], row['year'], row['description'],
+                row['category_slug'],
+                [genre['slug'] for genre in genres[row['id']]],
+                None if row['rating'] is None else float(row['rating']),
+            )
+
+
+class ReviewExport:
+    fields = ('id', 'title_id', 'author', 'text', 'score', 'pub_date')
+    updated_field = 'modified'
+
+    def get_queryset(self):
+        return Review.objects.values_list(
+            'id', 'title_id', 'author__username', 'text', 'score',
+            'pub_date')
+
+    def to_rows(self, rows):
+        format_datetime = datetime_formatter()
+        for row in rows:
+            yield row[:-1] + (format_datetime(row[-1]),)
+
+
+class CommentExport(ReviewExport):
+    fields = ('id', 'review_id', 'title_id', 'author', 'text', 'pub_date')
+
+    def get_queryset(self):
+        return Comment.objects.values_list(
+            'id', 'review_id', 'review__title_id', 'author__username',
+            'text', 'pub_date')
+
+
+EXPORTS = {
+    'titles': TitleExport,
+    'reviews': ReviewExport,
+    'comments': CommentExport,
+}
+
+
+def parse_since(value):
+    since = parse_datetime(value)
+    if since is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        since = datetime.combine(day, time.min)
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def filter_export(export, queryset, params):
+    """Apply ``updated_since`` and ``after_id`` (to resume a dump)."""
+    try:
+        if params.get('updated_since'):
+            queryset = queryset.filter(**{
+                f'{export.updated_field}__gte':
+                    parse_since(params['updated_since'])
+            })
+        if params.get('after_id'):
+            queryset = queryset.filter(id__gt=int(params['after_id']))
+    except ValueError as error:
+        raise ValidationError(
+            f'Некорректное значение фильтра: {error}') from error
+    return queryset.order_by('id')
+
+
+def encode_ndjson(fields, rows):
+    return ''.join(
+        json.dumps(dict(zip(fields, row)), cls=DjangoJSONEncoder,
+                   ensure_ascii=False) + '\n'
+        for row in rows
+    )
+
+
+def encode_csv(fields, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(
+            ','.join(value) if isinstance(value, list) else value
+            for value in row
+        )
+    return buffer.getvalue()
+
+
+def stream_export(export, queryset, output):
+    encode = encode_csv if output == 'csv' else encode_ndjson
+    if output == 'csv':
+        yield encode_csv(None, [export.fields])
+    rows = iter_by_pk(queryset, settings.EXPORT_CHUNK_SIZE)
+    while True:
+        chunk = list(islice(rows, settings.EXPORT_CHUNK_SIZE))
+        if not chunk:
+            return
+        yield encode(export.fields, export.to_rows(chunk))
+
+
+def export_response(resource, params):
+    export = EXPORTS[resource]()
+    output = params.get('output', 'ndjson')
+    if output not in CONTENT_TYPES:
+        raise ValidationError('Формат выгрузки должен быть одним из: '
+                              + ', '.join(CONTENT_TYPES))
+    queryset = filter_export(export, export.get_queryset(), params)
+    response = StreamingHttpResponse(
+        stream_export(export, queryset, output),
+        content_type=CONTENT_TYPES[output]
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{resource}.{output}"')
+    response['Cache-Control'] = 'no-store'
+    return response
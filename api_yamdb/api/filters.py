@@ -1,26 +1,73 @@
 from django_filters import rest_framework as filters
+from rest_framework.filters import SearchFilter
 
-from reviews.models import Title
+from reviews.models import Category, Genre, Title
+from reviews.search import search_titles
+
+
+class CharInFilter(filters.BaseInFilter, filters.CharFilter):
+    pass
 
 
 class TitleFilter(filters.FilterSet):
-    category = filters.CharFilter(
-        field_name='category__slug',
-        lookup_expr='icontains'
-    )
-    genre = filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='icontains'
-    )
+    """Exact and range filters resolved to ids.
+
+    Genre and category slugs are looked up once and titles are matched
+    by ``pk IN (subquery)``, so the genre join neither scans by slug nor
+    duplicates rows. The old substring matching is kept behind the
+    explicit ``__icontains`` parameters.
+    """
+    category = filters.CharFilter(method='filter_category')
+    genre = CharInFilter(method='filter_genre')
     name = filters.CharFilter(
         field_name='name',
         lookup_expr='icontains'
     )
-    year = filters.NumberFilter(
+    year = filters.NumberFilter(field_name='year')
+    year__gte = filters.NumberFilter(field_name='year', lookup_expr='gte')
+    year__lte = filters.NumberFilter(field_name='year', lookup_expr='lte')
+    category__icontains = filters.CharFilter(
+        field_name='category__slug',
+        lookup_expr='icontains'
+    )
+    genre__icontains = filters.CharFilter(method='filter_genre_icontains')
+    year__icontains = filters.NumberFilter(
         field_name='year',
         lookup_expr='icontains'
     )
 
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = ('category', 'genre', 'name', 'year')
+
+    def filter_category(self, queryset, name, value):
+        category_id = Category.objects.filter(
+            slug=value).values_list('id', flat=True).first()
+        if category_id is None:
+            return queryset.none()
+        return queryset.filter(category_id=category_id)
+
+    def filter_by_genres(self, queryset, genres):
+        genre_ids = list(genres.values_list('id', flat=True))
+        if not genre_ids:
+            return queryset.none()
+        return queryset.filter(pk__in=Title.genre.through.objects.filter(
+            genre_id__in=genre_ids).values('title_id'))
+
+    def filter_genre(self, queryset, name, value):
+        return self.filter_by_genres(
+            queryset, Genre.objects.filter(slug__in=value))
+
+    def filter_genre_icontains(self, queryset, name, value):
+        return self.filter_by_genres(
+            queryset, Genre.objects.filter(slug__icontains=value))
+
+
+class TitleSearchFilter(SearchFilter):
+    """Ranked full-text search over title name and description."""
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return search_titles(queryset, query)
@@ -0,0 +1,57 @@
+import time
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory, override_settings
+
+
+def start_response(status, headers):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает время запроса к API с новым соединением с базой '
+            'на каждый запрос и с повторным использованием соединения')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--path', default='/api/v1/categories/')
+
+    def measure(self, handler, environ, requests):
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = handler(dict(environ), start_response)
+            b''.join(response)
+            # Sends request_finished, which closes or keeps the connection.
+            response.close()
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        return timings
+
+    def report(self, name, timings):
+        median = timings[len(timings) // 2]
+        p95 = timings[int(len(timings) * 0.95)]
+        self.stdout.write(
+            f'{name:<16} median {median * 1000:7.2f} ms  '
+            f'p95 {p95 * 1000:7.2f} ms'
+        )
+
+    def handle(self, *args, **options):
+        environ = RequestFactory()._base_environ(PATH_INFO=options['path'])
+        max_age = connection.settings_dict['CONN_MAX_AGE']
+        # Responses are not cached, so every request reads the database.
+        with override_settings(API_CACHE_ENABLED=False,
+                               ALLOWED_HOSTS=['testserver']):
+            handler = WSGIHandler()
+            self.measure(handler, environ, 5)
+            try:
+                for name, age in (('new connection', 0),
+                                  ('reused', max_age or 60)):
+                    connection.close()
+                    connection.settings_dict['CONN_MAX_AGE'] = age
+                    self.report(name, self.measure(
+                        handler, environ, options['requests']))
+            finally:
+                connection.settings_dict['CONN_MAX_AGE'] = max_age
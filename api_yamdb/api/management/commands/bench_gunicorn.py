@@ -0,0 +1,103 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def read_kilobytes(path, field):
+    try:
+        with open(path) as lines:
+            for line in lines:
+                if line.startswith(field):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def get_children(pid):
+    children = []
+    for stat in Path('/proc').glob('[0-9]*/stat'):
+        try:
+            # The command may contain spaces, the fields after it do not.
+            fields = stat.read_text().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(stat.parent.name))
+    return children
+
+
+class Command(BaseCommand):
+    help = ('Запускает gunicorn с gunicorn.conf.py и измеряет время от '
+            'запуска до первого ответа и память воркеров (Linux)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--requests', type=int, default=50)
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--path', default='/api/v1/titles/')
+
+    def start(self, options, preload):
+        env = dict(
+            os.environ,
+            GUNICORN_BIND=f'127.0.0.1:{options["port"]}',
+            GUNICORN_WORKERS=str(options['workers']),
+            GUNICORN_PRELOAD=str(preload),
+        )
+        return subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'],
+            cwd=settings.BASE_DIR, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+    def first_response(self, url, server, started):
+        while server.poll() is None:
+            try:
+                with urlopen(url, timeout=5) as response:
+                    response.read()
+                return time.perf_counter() - started
+            except (URLError, ConnectionError):
+                time.sleep(0.01)
+        raise CommandError('gunicorn завершился, не ответив на запрос')
+
+    def measure(self, options, preload):
+        url = f'http://127.0.0.1:{options["port"]}{options["path"]}'
+        started = time.perf_counter()
+        server = self.start(options, preload)
+        try:
+            cold_start = self.first_response(url, server, started)
+            for _ in range(options['requests']):
+                with urlopen(url, timeout=5) as response:
+                    response.read()
+            workers = get_children(server.pid)
+            rss = [read_kilobytes(f'/proc/{pid}/status', 'VmRSS:')
+                   for pid in workers]
+            pss = [read_kilobytes(f'/proc/{pid}/smaps_rollup', 'Pss:')
+                   for pid in workers]
+        finally:
+            server.terminate()
+            server.wait()
+        return cold_start, rss, pss
+
+    def report(self, name, cold_start, rss, pss):
+        def average(values):
+            values = [value for value in values if value is not None]
+            if not values:
+                return '      -'
+            return f'{sum(values) / len(values) / 1024:7.1f}'
+
+        self.stdout.write(
+            f'{name:<12} first response {cold_start * 1000:8.1f} ms  '
+            f'RSS {average(rss)} MB  PSS {average(pss)} MB per worker'
+        )
+
+    def handle(self, *args, **options):
+        for name, preload in (('no preload', False), ('preload', True)):
+            self.report(name, *self.measure(options, preload))
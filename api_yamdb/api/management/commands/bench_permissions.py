@@ -0,0 +1,138 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from api.permissions import (AdminModeratorAuthorPermission,
+                             ReviewsCommentsPermission)
+from reviews.models import Comment, Review, Title
+from users.models import User
+
+
+class Rollback(Exception):
+    pass
+
+
+def author_permission(request, obj):
+    """The former check, which loads ``obj.author`` to compare users."""
+    return (obj.author == request.user
+            or request.user.is_admin
+            or request.user.is_moderator)
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает проверку прав на изменение отзывов и комментариев '
+            'с загрузкой автора и по author_id; изменения откатываются')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=200)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def measure(self, function, repeat):
+        best = None
+        queries = 0
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                function()
+                elapsed = time.perf_counter() - started
+            queries = len(context)
+            best = elapsed if best is None else min(best, elapsed)
+        return best, queries
+
+    def report(self, name, timing, rows):
+        elapsed, queries = timing
+        self.stdout.write(
+            f'{name:<28} {elapsed / rows * 1000:8.3f} ms  '
+            f'{queries / rows:5.2f} queries per object'
+        )
+
+    def create_objects(self, rows):
+        title = Title.objects.create(name='Произведение', year=2000)
+        User.objects.bulk_create(
+            User(username=f'bench{index}', email=f'bench{index}@yamdb.fake')
+            for index in range(rows)
+        )
+        authors = list(User.objects.filter(username__startswith='bench'))
+        Review.objects.bulk_create(
+            Review(title=title, author=author, text='Отзыв', score=5)
+            for author in authors
+        )
+        Title.objects.filter(pk=title.pk).recalculate_rating()
+        reviews = list(Review.objects.filter(title=title).select_related(
+            'author').order_by('id'))
+        Comment.objects.bulk_create(
+            Comment(review=review, author=review.author, text='Комментарий')
+            for review in reviews
+        )
+        comments = dict(Comment.objects.filter(
+            review__in=reviews).values_list('review_id', 'id'))
+        return [
+            (f'/api/v1/titles/{title.pk}/reviews/{review.pk}/',
+             comments[review.pk], review.author)
+            for review in reviews
+        ]
+
+    def bench_checks(self, model, permission, rows, repeat):
+        # Objects as the views load them for writes, without the author.
+        objects = list(model.objects.order_by('id')[:rows])
+        users = {user.pk: user for user in User.objects.filter(
+            pk__in=[obj.author_id for obj in objects])}
+        requests = [
+            Request(APIRequestFactory().patch('/'))
+            for _ in objects
+        ]
+        for request, obj in zip(requests, objects):
+            request.user = users[obj.author_id]
+        name = model._meta.model_name
+
+        def check(function):
+            def run():
+                for request, obj in zip(requests, objects):
+                    # Drop what the previous run cached on the object.
+                    obj._state.fields_cache.pop('author', None)
+                    function(request, obj)
+            return run
+
+        self.report(f'{name} author check', self.measure(
+            check(author_permission), repeat), rows)
+        self.report(f'{name} author_id check', self.measure(
+            check(lambda request, obj: permission.has_object_permission(
+                request, None, obj)), repeat), rows)
+
+    def bench_requests(self, targets, rows):
+        client = APIClient()
+
+        def patch():
+            for url, comment_id, author in targets:
+                client.force_authenticate(author)
+                client.patch(url, {'text': 'Новый текст'})
+                client.patch(f'{url}comments/{comment_id}/',
+                             {'text': 'Новый комментарий'})
+
+        def delete():
+            for url, comment_id, author in targets:
+                client.force_authenticate(author)
+                client.delete(f'{url}comments/{comment_id}/')
+                client.delete(url)
+
+        self.report('PATCH review and comment', self.measure(patch, 1), rows)
+        self.report('DELETE comment and review', self.measure(delete, 1),
+                    rows)
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        try:
+            with transaction.atomic():
+                targets = self.create_objects(rows)
+                self.bench_checks(
+                    Review, ReviewsCommentsPermission(), rows, repeat)
+                self.bench_checks(
+                    Comment, AdminModeratorAuthorPermission(), rows, repeat)
+                self.bench_requests(targets, rows)
+                raise Rollback
+        except Rollback:
+            pass
@@ -0,0 +1,303 @@
+import hashlib
+import json
+from collections import OrderedDict
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (Cursor, CursorPagination,
+                                       LimitOffsetPagination,
+                                       PageNumberPagination)
+from rest_framework.utils.urls import replace_query_param
+
+
+def estimate_count(queryset):
+    """Return the planner row estimate, or None if it is unavailable."""
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def get_cheap_count(queryset, view=None):
+    """Count a queryset as cheaply as possible.
+
+    Returns ``(count, exact)``. The count is taken from a counter
+    maintained by the view, from the short-lived count cache, from the
+    planner estimate for large results or, finally, from ``COUNT(*)``.
+    """
+    get_list_count = getattr(view, 'get_list_count', None)
+    if get_list_count is not None:
+        count = get_list_count()
+        if count is not None:
+            return count, True
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return 0, True
+    cache_key = 'pagination-count:' + hashlib.md5(
+        repr((queryset.db, sql, params)).encode()).hexdigest()
+    count = cache.get(cache_key)
+    if count is not None:
+        return count, False
+    exact = True
+    count = estimate_count(queryset)
+    if count is None or count < settings.PAGINATION_ESTIMATE_THRESHOLD:
+        count = queryset.count()
+    else:
+        exact = False
+    cache.set(cache_key, count, settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+    return count, exact
+
+
+class PrecountedPaginator(Paginator):
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            self.count = count
+
+
+def get_keyset_filter(ordering, position):
+    """Select the rows that follow ``position`` in ``ordering``.
+
+    This is the row comparison ``(a, b) > (x, y)`` spelled out per field,
+    so the fields may be sorted in different directions. The bound on
+    the first field is redundant and lets the database start an index
+    scan there.
+    """
+    after = Q()
+    equal = Q()
+    for field, value in zip(ordering, position):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        after |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+    first = ordering[0]
+    lookup = 'lte' if first.startswith('-') else 'gte'
+    return Q(**{f'{first.lstrip("-")}__{lookup}': position[0]}) & after
+
+
+def reverse_ordering(ordering):
+    return tuple(
+        field[1:] if field.startswith('-') else '-' + field
+        for field in ordering
+    )
+
+
+class KeysetPagination(CursorPagination):
+    """Keyset pagination with the page size taken from ``limit``.
+
+    DRF's cursor keeps only the first ordering field and skips the rows
+    that share its value with an offset. Here the cursor holds the value
+    of every ordering field, so the ordering must end with a unique
+    field, and each page starts right after the previous one.
+    """
+    page_size_query_param = 'limit'
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.decode_position()
+        ordering = reverse_ordering(self.ordering) if reverse else (
+            self.ordering)
+        queryset = self.with_ordering_fields(queryset).order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(get_keyset_filter(ordering, position))
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        return self.page
+
+    def with_ordering_fields(self, queryset):
+        # values() rows need the ordering fields to build the cursor.
+        fields = getattr(queryset, '_fields', None)
+        if not fields:
+            return queryset
+        missing = [
+            field.lstrip('-') for field in self.ordering
+            if field.lstrip('-') not in fields
+        ]
+        return queryset.values(*fields, *missing) if missing else queryset
+
+    def decode_position(self):
+        if self.cursor is None or self.cursor.position is None:
+            return None
+        try:
+            position = json.loads(self.cursor.position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if (not isinstance(position, list)
+                or len(position) != len(self.ordering)):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def encode_position(self, row):
+        values = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            values.append(
+                row[name] if isinstance(row, dict) else getattr(row, name))
+        # str() keeps the microseconds of datetimes, unlike isoformat()
+        # in DjangoJSONEncoder.
+        return json.dumps(values, default=str)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(
+            offset=0, reverse=False,
+            position=self.encode_position(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(Cursor(
+            offset=0, reverse=True,
+            position=self.encode_position(self.page[0])))
+
+
+class CursorOptInMixin:
+    """Switch a paginator to keyset mode when ``cursor`` is passed.
+
+    Clients start with ``?cursor=`` and then follow the ``next`` links.
+    Without the parameter the list keeps its usual pagination, so
+    existing clients are not affected.
+    """
+    cursor_query_param = 'cursor'
+    cursor_ordering = ('-pk',)
+
+    def get_cursor_ordering(self, request):
+        return self.cursor_ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_paginator = None
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+        self.keyset_paginator = KeysetPagination()
+        self.keyset_paginator.ordering = self.get_cursor_ordering(request)
+        return self.keyset_paginator.paginate_queryset(
+            queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset_paginator is not None:
+            return self.keyset_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class CheapCountMixin:
+    """Serve total counts via ``get_cheap_count`` and report exactness."""
+    count_exact = True
+
+    def get_count(self, queryset):
+        count, self.count_exact = get_cheap_count(
+            queryset, getattr(self, 'view', None))
+        return count
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        paginated = OrderedDict()
+        for key, value in response.data.items():
+            paginated[key] = value
+            if key == 'count':
+                paginated['count_exact'] = self.count_exact
+        response.data = paginated
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        if 'count' in schema['properties']:
+            schema['properties']['count_exact'] = {'type': 'boolean'}
+        return schema
+
+
+class CheapCountLimitOffsetPagination(CheapCountMixin, LimitOffsetPagination):
+    """Limit/offset pages that do not trust an inexact count.
+
+    An estimated or cached count may be lower than the real one. It is
+    then only reported: the page is read with one extra row, which tells
+    whether there is a next page.
+    """
+    has_next = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.count = self.get_count(queryset)
+        self.offset = self.get_offset(request)
+        self.request = request
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+        if self.count_exact:
+            if self.count == 0 or self.offset > self.count:
+                return []
+            return list(queryset[self.offset:self.offset + self.limit])
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        return rows[:self.limit]
+
+    def get_next_link(self):
+        if self.count_exact:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = replace_query_param(
+            self.request.build_absolute_uri(),
+            self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit)
+
+
+class CheapCountPageNumberPagination(CheapCountMixin, PageNumberPagination):
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+        if self.get_page_size(request) is not None:
+            self.django_paginator_class = partial(
+                PrecountedPaginator, count=self.get_count(queryset))
+        return super().paginate_queryset(queryset, request, view)
+
+
+class TitlePagination(CursorOptInMixin, CheapCountLimitOffsetPagination):
+    """Titles in keyset mode are ordered by ``id`` or by ``rating``."""
+    ordering_query_param = 'ordering'
+    cursor_orderings = {
+        'id': ('id',),
+        'rating': ('-rating_key', 'id'),
+    }
+
+    def get_cursor_ordering(self, request):
+        return self.cursor_orderings.get(
+            request.query_params.get(self.ordering_query_param),
+            self.cursor_orderings['id']
+        )
+
+
+class ReviewPagination(CursorOptInMixin, CheapCountPageNumberPagination):
+    cursor_ordering = ('-pub_date', '-id')
+
+
+class CommentPagination(CursorOptInMixin, CheapCountLimitOffsetPagination):
+    cursor_ordering = ('pub_date', 'id')
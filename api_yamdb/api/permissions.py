@@ -1,32 +1,53 @@
 from rest_framework import permissions
 
 
+def get_roles(user):
+    """Return ``(is_admin, is_moderator)`` of the principal.
+
+    Computed once and kept on the principal, which lives for one request.
+    """
+    try:
+        return user._roles
+    except AttributeError:
+        pass
+    if user.is_authenticated:
+        user._roles = (user.is_admin, user.is_moderator)
+    else:
+        user._roles = (False, False)
+    return user._roles
+
+
+def is_author(request, obj):
+    # author_id avoids loading the author row of the object.
+    return obj.author_id == request.user.pk
+
+
 class IsUserAdmin(permissions.BasePermission):
     """Check if User is Admin."""
     def has_permission(self, request, view):
-        return not request.user.is_authenticated or request.user.is_admin
+        return not request.user.is_authenticated or get_roles(request.user)[0]
 
 
 class IsUserAdminOrReadOnly(permissions.BasePermission):
     """Check if User is Admin or allow only GET method."""
     def has_permission(self, request, view):
         return (request.method in permissions.SAFE_METHODS
-                or request.user.is_admin)
+                or get_roles(request.user)[0])
 
 
 class ReviewsCommentsPermission(permissions.BasePermission):
     """Permissions for Reviews and Comments."""
     def has_object_permission(self, request, view, obj):
-        return (obj.author == request.user
-                or request.method in permissions.SAFE_METHODS
-                or request.user.is_admin or request.user.is_moderator)
+        return (request.method in permissions.SAFE_METHODS
+                or is_author(request, obj)
+                or any(get_roles(request.user)))
 
 
 class TitlePermission(permissions.BasePermission):
     """Permissions for Titles."""
     def has_object_permission(self, request, view, obj):
         return (request.method in permissions.SAFE_METHODS
-                or request.user.is_admin)
+                or get_roles(request.user)[0])
 
 
 class AdminModeratorAuthorPermission(permissions.BasePermission):
@@ -39,7 +60,6 @@ class AdminModeratorAuthorPermission(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         return (
             request.method in permissions.SAFE_METHODS
-            or obj.author == request.user
-            or request.user.is_moderator
-            or request.user.is_admin
+            or is_author(request, obj)
+            or any(get_roles(request.user))
         )
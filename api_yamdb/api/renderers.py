@@ -0,0 +1,36 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson when it is installed.
+
+    The output matches JSONRenderer with the default settings byte for
+    byte: compact, UTF-8, U+2028/U+2029 escaped. Datetimes, lazy strings,
+    decimals and other values orjson does not handle natively go through
+    the DRF encoder. Indented output, non-default JSON settings and data
+    orjson refuses (non-string keys, integers over 64 bits) fall back to
+    the stdlib. The one known difference is floats that Python prints in
+    exponent notation (below 1e-4 or from 1e16), which the API does not
+    return.
+    """
+    options = (orjson.OPT_PASSTHROUGH_DATETIME
+               | orjson.OPT_PASSTHROUGH_DATACLASS) if orjson else None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or not self.compact
+                or self.ensure_ascii or self.get_indent(
+                    accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default,
+                option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(
+            b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,172 @@
+"""Read replica routing.
+
+``ReplicaMiddleware`` picks one replica per safe API request by smooth
+weighted round-robin over ``DATABASE_REPLICAS`` and ``ReplicaRouter``
+sends that request's reads there. Everything else uses ``default``:
+writes, reads after a write in the same request, reads inside a
+transaction, requests from a client that wrote less than
+``REPLICA_PIN_SECONDS`` ago (a cookie remembers it), and replicas that
+lag more than ``REPLICA_MAX_LAG`` seconds or cannot be reached.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+PIN_COOKIE = 'primary_until'
+
+state = threading.local()
+
+
+def get_replica():
+    """Return the alias reads of the current request may use, if any."""
+    if getattr(state, 'pinned', True):
+        return None
+    return state.replica
+
+
+def pin_primary():
+    state.pinned = True
+
+
+class Balancer:
+    """Smooth weighted round-robin that skips unhealthy replicas."""
+
+    def __init__(self):
+        self.current = {}
+        self.lock = threading.Lock()
+
+    def choose(self, weights, healthy):
+        with self.lock:
+            candidates = [alias for alias in weights if healthy(alias)]
+            if not candidates:
+                return None
+            total = 0
+            for alias in candidates:
+                self.current[alias] = (
+                    self.current.get(alias, 0) + weights[alias])
+                total += weights[alias]
+            best = max(candidates, key=self.current.__getitem__)
+            self.current[best] -= total
+            return best
+
+
+balancer = Balancer()
+
+
+def replica_lag(alias):
+    """Seconds the replica is behind the primary, None if unreachable."""
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT CASE WHEN pg_last_wal_receive_lsn() '
+                '= pg_last_wal_replay_lsn() THEN 0 ELSE EXTRACT(EPOCH FROM '
+                'now() - pg_last_xact_replay_timestamp()) END'
+            )
+            lag = cursor.fetchone()[0]
+    except Exception:
+        connection.close()
+        return None
+    return float(lag or 0)
+
+
+class ReplicaHealth:
+    """Per-process view of replica lag, refreshed every few seconds."""
+
+    def __init__(self):
+        self.checked = {}
+        self.lock = threading.Lock()
+
+    def is_healthy(self, alias):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.checked.get(alias)
+        if entry is None or entry[1] < now:
+            lag = replica_lag(alias)
+            healthy = lag is not None and lag <= settings.REPLICA_MAX_LAG
+            entry = (healthy, now + settings.REPLICA_CHECK_INTERVAL)
+            with self.lock:
+                self.checked[alias] = entry
+        return entry[0]
+
+    def clear(self):
+        with self.lock:
+            self.checked.clear()
+
+
+health = ReplicaHealth()
+
+
+def is_pinned_by_cookie(request):
+    try:
+        return float(request.COOKIES[PIN_COOKIE]) > time.time()
+    except (KeyError, ValueError):
+        return False
+
+
+def reads_own_writes(request):
+    """Whether the client wrote recently and must not see older data."""
+    return bool(settings.DATABASE_REPLICAS) and is_pinned_by_cookie(request)
+
+
+def may_use_replica(request):
+    return (
+        settings.DATABASE_REPLICAS
+        and request.method in SAFE_METHODS
+        and request.path.startswith(settings.REPLICA_READ_PATHS)
+        and not is_pinned_by_cookie(request)
+    )
+
+
+class ReplicaMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state.replica = None
+        if may_use_replica(request):
+            state.replica = balancer.choose(
+                settings.DATABASE_REPLICAS, health.is_healthy)
+        state.pinned = state.replica is None
+        state.wrote = False
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = state.wrote
+            state.replica = None
+            state.pinned = True
+        if wrote:
+            # Replicas may not have the write yet: the client reads
+            # from the primary for a while.
+            response.set_cookie(
+                PIN_COOKIE, str(time.time() + settings.REPLICA_PIN_SECONDS),
+                max_age=settings.REPLICA_PIN_SECONDS, httponly=True,
+                samesite='Lax')
+        return response
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        replica = get_replica()
+        if replica is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return replica
+
+    def db_for_write(self, model, **hints):
+        pin_primary()
+        state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
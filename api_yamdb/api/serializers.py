@@ -1,8 +1,5 @@
 from django.conf import settings
 from django.contrib.auth.validators import UnicodeUsernameValidator
-from django.core.exceptions import BadRequest
-from django.db.models import Avg
-from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 
 from reviews.models import Category, Comment, Genre, Review, Title
@@ -28,10 +25,7 @@ class GenreSerializer(serializers.ModelSerializer):
 class TitleSerializer(serializers.ModelSerializer):
     genre = GenreSerializer(read_only=True, many=True)
     category = CategorySerializer(read_only=True,)
-    rating = serializers.SerializerMethodField()
-
-    def get_rating(self, obj):
-        return obj.reviews.aggregate(Avg('score')).get('score__avg')
+    rating = serializers.FloatField(read_only=True)
 
     class Meta:
         fields = (
@@ -54,6 +48,16 @@ class PostTitleSerializer(serializers.ModelSerializer):
         model = Title
 
 
+class BulkTitleSerializer(serializers.Serializer):
+    """One item of a bulk upload; slugs are resolved by the view."""
+    name = serializers.CharField(max_length=settings.NAME_LEN)
+    year = serializers.IntegerField(validators=(validate_year,))
+    description = serializers.CharField(
+        required=False, allow_blank=True, allow_null=True)
+    genre = serializers.ListField(child=serializers.SlugField())
+    category = serializers.SlugField()
+
+
 class ReviewSerializer(serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username'
@@ -63,17 +67,6 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'score', 'pub_date')
         model = Review
 
-    def validate(self, data):
-        title = get_object_or_404(
-            Title, pk=self.context['view'].kwargs["title_id"])
-        review = title.reviews.filter(
-            author_id=self.context['request'].user.pk)
-        if self.context['request'].method == 'POST' and review:
-            raise BadRequest(
-                'Можно оставить только один отзыв к одному произведению'
-            )
-        return data
-
 
 class CommentSerializer(serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
@@ -0,0 +1,52 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_init,
+                                      post_save)
+from django.dispatch import receiver
+
+from api.cache import bump_versions
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+# Resources whose cached responses change with each model. Deleting a
+# user deletes their reviews and comments, which bump their resources.
+INVALIDATED_RESOURCES = {
+    Category: ('categories', 'titles'),
+    Genre: ('genres', 'titles'),
+    Title: ('titles', 'reviews'),
+    Review: ('reviews', 'titles'),
+    Comment: ('comments',),
+}
+
+
+def invalidate_cached_responses(sender, **kwargs):
+    bump_versions(*INVALIDATED_RESOURCES[sender])
+
+
+# Connected per model: a receiver without a sender would run for every
+# model and take Django's fast delete path away from all of them.
+for model in INVALIDATED_RESOURCES:
+    post_save.connect(invalidate_cached_responses, sender=model)
+    post_delete.connect(invalidate_cached_responses, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_versions('titles')
+
+
+@receiver(post_init, sender=User)
+def remember_username(sender, instance, **kwargs):
+    # __dict__, so a deferred username is not loaded.
+    instance._loaded_username = instance.__dict__.get('username')
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_names(sender, instance, created, update_fields,
+                            **kwargs):
+    """Reviews and comments show the author's username, nothing else."""
+    if created or (update_fields is not None
+                   and 'username' not in update_fields):
+        return
+    if instance._loaded_username != instance.username:
+        instance._loaded_username = instance.username
+        bump_versions('reviews', 'comments')
@@ -1,9 +1,9 @@
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework.routers import DefaultRouter
 
 from api.views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                       ReviewViewSet, TitleViewSet, UserViewSet, get_token,
-                       sign_up)
+                       ReviewViewSet, TitleViewSet, UserViewSet, export,
+                       get_token, sign_up)
 
 router_v1 = DefaultRouter()
 
@@ -23,4 +23,5 @@ urlpatterns = [
     path('v1/', include(router_v1.urls)),
     path('v1/auth/token/', get_token),
     path('v1/auth/signup/', sign_up),
+    re_path(r'^v1/export/(?P<resource>titles|reviews|comments)/$', export),
 ]
@@ -1,28 +1,39 @@
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db import IntegrityError
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import mixins, permissions, status, viewsets
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 from rest_framework.serializers import ValidationError
 from rest_framework.status import HTTP_200_OK
-from rest_framework_simplejwt.tokens import AccessToken
 
-from api.filters import TitleFilter
+from api.cache import (CachedListMixin, CachedRetrieveMixin,
+                       ContentETagRetrieveMixin, bump_versions)
+from api.export import export_response
+from api.fast_serializers import (CommentRowSerializer, FastListMixin,
+                                  ReviewRowSerializer, TitleRowSerializer)
+from api.filters import TitleFilter, TitleSearchFilter
+from api.pagination import (CommentPagination, ReviewPagination,
+                            TitlePagination)
 from api.permissions import (AdminModeratorAuthorPermission, IsUserAdmin,
                              IsUserAdminOrReadOnly, ReviewsCommentsPermission)
-from api.serializers import (CategorySerializer, CommentSerializer,
-                             GenreSerializer, PostTitleSerializer,
-                             ReviewSerializer, SignUpSerializer,
-                             TitleSerializer, TokenSerializer, UserSerializer)
+from api.serializers import (BulkTitleSerializer, CategorySerializer,
+                             CommentSerializer, GenreSerializer,
+                             PostTitleSerializer, ReviewSerializer,
+                             SignUpSerializer, TitleSerializer,
+                             TokenSerializer, UserSerializer)
 from reviews.models import Category, Genre, Review, Title
+from users.authentication import get_access_token
 from users.models import User
+from users.outbox import enqueue_email
 
 
-class CategoryViewSet(mixins.ListModelMixin,
+class CategoryViewSet(CachedListMixin,
+                      mixins.ListModelMixin,
                       mixins.CreateModelMixin,
                       mixins.DestroyModelMixin,
                       viewsets.GenericViewSet):
@@ -33,52 +44,196 @@ class CategoryViewSet(mixins.ListModelMixin,
     search_fields = ('name',)
     lookup_field = 'slug'
     pagination_class = LimitOffsetPagination
+    cache_resources = ('categories',)
 
 
 class GenreViewSet(CategoryViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_resources = ('genres',)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all()
+class TitleViewSet(CachedListMixin, ContentETagRetrieveMixin, FastListMixin,
+                   viewsets.ModelViewSet):
+    queryset = Title.objects.with_rating().select_related(
+        'category'
+    ).prefetch_related(
+        Prefetch('genre', queryset=Genre.objects.only(
+            'name', 'slug').order_by('id'))
+    ).order_by('id')
     permission_classes = (permissions.IsAuthenticatedOrReadOnly,
                           IsUserAdminOrReadOnly, )
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (DjangoFilterBackend, TitleSearchFilter)
     filterset_class = TitleFilter
-    pagination_class = LimitOffsetPagination
+    pagination_class = TitlePagination
+    cache_resources = ('titles', 'genres', 'categories')
+    row_serializer_class = TitleRowSerializer
 
     def get_serializer_class(self):
         if self.action in ('create', 'partial_update'):
             return PostTitleSerializer
+        if self.action == 'bulk':
+            return BulkTitleSerializer
         return TitleSerializer
 
+    @action(
+        methods=['post'],
+        detail=False,
+        permission_classes=(permissions.IsAuthenticated, IsUserAdmin)
+    )
+    def bulk(self, request):
+        """Create many titles; invalid items are reported, not fatal."""
+        if not isinstance(request.data, list):
+            raise ValidationError('Ожидается список произведений')
+        if len(request.data) > settings.TITLES_BULK_MAX_SIZE:
+            raise ValidationError(
+                'Не больше {} произведений за запрос'.format(
+                    settings.TITLES_BULK_MAX_SIZE))
+        items, errors = {}, {}
+        for index, item in enumerate(request.data):
+            serializer = BulkTitleSerializer(data=item)
+            if serializer.is_valid():
+                items[index] = serializer.validated_data
+            else:
+                errors[index] = serializer.errors
+        titles = self.build_bulk_titles(items, errors)
+        self.save_bulk_titles(titles)
+        return Response(
+            {
+                'created': [
+                    {'index': index, 'id': title.pk}
+                    for index, title in titles.items()
+                ],
+                'errors': [
+                    {'index': index, 'errors': errors[index]}
+                    for index in sorted(errors)
+                ],
+            },
+            status=(status.HTTP_201_CREATED if titles or not errors
+                    else status.HTTP_400_BAD_REQUEST)
+        )
+
+    def build_bulk_titles(self, items, errors):
+        """Resolve all slugs with one query per model into Title objects.
 
-class ReviewViewSet(viewsets.ModelViewSet):
+        Items with unknown slugs are moved to ``errors``. Each title gets
+        the resolved ``genre_ids`` for the through table.
+        """
+        genres = dict(Genre.objects.filter(slug__in={
+            slug for item in items.values() for slug in item['genre']
+        }).values_list('slug', 'id'))
+        categories = dict(Category.objects.filter(slug__in={
+            item['category'] for item in items.values()
+        }).values_list('slug', 'id'))
+        titles = {}
+        for index, item in items.items():
+            item_errors = {}
+            unknown = [slug for slug in item['genre'] if slug not in genres]
+            if unknown:
+                item_errors['genre'] = [
+                    f'Жанр {slug} не найден' for slug in unknown]
+            if item['category'] not in categories:
+                item_errors['category'] = [
+                    f'Категория {item["category"]} не найдена']
+            if item_errors:
+                errors[index] = item_errors
+                continue
+            titles[index] = Title(
+                name=item['name'],
+                year=item['year'],
+                description=item.get('description'),
+                category_id=categories[item['category']],
+            )
+            titles[index].genre_ids = [
+                genres[slug] for slug in dict.fromkeys(item['genre'])]
+        return titles
+
+    def save_bulk_titles(self, titles):
+        with transaction.atomic():
+            if connection.features.can_return_rows_from_bulk_insert:
+                Title.objects.bulk_create(
+                    titles.values(), batch_size=settings.BULK_BATCH_SIZE)
+            else:
+                for title in titles.values():
+                    title.save()
+            Title.genre.through.objects.bulk_create(
+                (
+                    Title.genre.through(title_id=title.pk, genre_id=genre_id)
+                    for title in titles.values()
+                    for genre_id in title.genre_ids
+                ),
+                batch_size=settings.BULK_BATCH_SIZE
+            )
+        # bulk_create sends no signals.
+        bump_versions('titles')
+
+
+class ReviewViewSet(CachedListMixin, CachedRetrieveMixin, FastListMixin,
+                    viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
+    row_serializer_class = ReviewRowSerializer
     permission_classes = (ReviewsCommentsPermission,
                           permissions.IsAuthenticatedOrReadOnly,)
+    pagination_class = ReviewPagination
+    cache_resources = ('reviews',)
 
     def get_title(self):
-        return get_object_or_404(Title, pk=self.kwargs.get("title_id"))
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title, pk=self.kwargs.get("title_id"))
+        return self._title
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        if self.request.method == 'DELETE':
+            # Permissions compare author_id, the rating signal needs
+            # title_id and score; the author row is not read.
+            return self.get_title().reviews.only(
+                'id', 'title_id', 'author_id', 'score')
+        return self.get_title().reviews.select_related('author').only(
+            'id', 'text', 'score', 'pub_date', 'modified', 'title_id',
+            'author__id', 'author__username'
+        )
+
+    def get_list_count(self):
+        return self.get_title().rating_count
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
+        # The unique_review constraint enforces one review per author.
+        try:
+            serializer.save(author=self.request.user, title=self.get_title())
+        except IntegrityError as error:
+            raise ValidationError(
+                'Можно оставить только один отзыв к одному произведению'
+            ) from error
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(CachedListMixin, CachedRetrieveMixin, FastListMixin,
+                     viewsets.ModelViewSet):
     serializer_class = CommentSerializer
+    row_serializer_class = CommentRowSerializer
     permission_classes = (AdminModeratorAuthorPermission,)
-    pagination_class = LimitOffsetPagination
+    pagination_class = CommentPagination
+    # A deleted review bumps "reviews" even when it had no comments.
+    cache_resources = ('comments', 'reviews')
 
     def get_review(self):
-        return get_object_or_404(Review, pk=self.kwargs.get("review_id"))
+        # The title is checked in the same query as the review.
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review,
+                pk=self.kwargs.get("review_id"),
+                title_id=self.kwargs.get("title_id")
+            )
+        return self._review
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        if self.request.method == 'DELETE':
+            return self.get_review().comments.only(
+                'id', 'review_id', 'author_id')
+        return self.get_review().comments.select_related('author').only(
+            'id', 'text', 'pub_date', 'modified', 'review_id',
+            'author__id', 'author__username'
+        )
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, review=self.get_review())
@@ -101,7 +256,7 @@ class UserViewSet(viewsets.ModelViewSet):
         permission_classes=[permissions.IsAuthenticated, ]
     )
     def get_patch_me(self, request):
-        user = get_object_or_404(User, username=self.request.user)
+        user = get_object_or_404(User, pk=self.request.user.pk)
         if request.method == 'GET':
             serializer = UserSerializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -117,13 +272,13 @@ class UserViewSet(viewsets.ModelViewSet):
 
 
 def send_confirmation_code(user):
+    # Delivered by manage.py send_outbox, not within the request.
     confirmation_code = default_token_generator.make_token(user)
-    return send_mail(
+    return enqueue_email(
         'Код подтверждения от yamdb',
         f'Код подтверждения:{confirmation_code}',
+        user.email,
         'admin@admin.ru',
-        [user.email],
-        fail_silently=False
     )
 
 
@@ -156,7 +311,7 @@ def get_token(request):
         token = request.data['confirmation_code']
         check_token = default_token_generator.check_token(user, token)
         if check_token is True:
-            token = AccessToken.for_user(user)
+            token = get_access_token(user)
             return Response({'token': str(token)}, status=status.HTTP_200_OK)
         if check_token is False:
             return Response(
@@ -168,3 +323,11 @@ def get_token(request):
             status=status.HTTP_200_OK
         )
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+@permission_classes((permissions.IsAuthenticated, IsUserAdmin))
+def export(request, resource):
+    """Stream every row of ``resource`` as NDJSON or, with
+    ``?output=csv``, as CSV."""
+    return export_response(resource, request.query_params)
@@ -41,6 +41,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.connections.ConnectionLimitMiddleware',
+    'api.replicas.ReplicaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -75,15 +77,68 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': os.getenv('DB_ENGINE', 'django.db.backends.postgresql'),
         'NAME': os.getenv('DB_NAME'),
         'USER': os.getenv('POSTGRES_USER'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
-        'PORT': os.getenv('DB_PORT')
+        'PORT': os.getenv('DB_PORT'),
+        # Seconds a connection is reused; 0 closes it after each request.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        # A transaction-level pooler (pgbouncer pool_mode=transaction)
+        # cannot keep cursors between transactions.
+        'DISABLE_SERVER_SIDE_CURSORS':
+            os.getenv('DB_TRANSACTION_POOLER', 'False') == 'True',
     }
 }
 
+# Reused connections idle for this many seconds are checked on request.
+DB_HEALTH_CHECK_IDLE = 10
+# Requests of one worker process using the database at once; 0 - no limit.
+DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', 0))
+DB_CONNECTION_WAIT = 5
+
+# Read replicas: DB_REPLICAS=host[*weight],... (database file names for
+# SQLite). Safe requests to REPLICA_READ_PATHS read from one of them.
+
+DATABASE_REPLICAS = {}
+for number, replica in enumerate(
+        filter(None, os.getenv('DB_REPLICAS', '').split(',')), 1):
+    location, _, weight = replica.strip().partition('*')
+    alias = f'replica{number}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME' if 'sqlite3' in DATABASES['default']['ENGINE'] else 'HOST':
+            location,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS[alias] = int(weight or 1)
+
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+REPLICA_READ_PATHS = ('/api/',)
+# Seconds a client reads from the primary after its own write.
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+REPLICA_MAX_LAG = float(os.getenv('REPLICA_MAX_LAG', 2))
+REPLICA_CHECK_INTERVAL = 5
+
+
+# Cache
+# The local-memory cache is per process, so invalidation would not reach
+# the other gunicorn workers: with it the response and user caches are
+# off. Use the file-based backend or Redis to enable them.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+API_CACHE_ENABLED = os.getenv('API_CACHE_ENABLED', 'True') == 'True'
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', 60))
+API_FAST_READ_PATH = os.getenv('API_FAST_READ_PATH', 'False') == 'True'
+
 
 # Password validation
 
@@ -128,7 +183,11 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
@@ -140,11 +199,25 @@ REST_FRAMEWORK = {
 
 DATETIME_INPUT_FORMATS += ('%Y-%m-%dT%H:%M:%S.%f%z', )
 
+# Per-process cache of authenticated users, see users/authentication.py.
+AUTH_USER_CACHE_SIZE = 10000
+AUTH_USER_CACHE_TIMEOUT = 60
+# Put the role into access tokens and authenticate safe requests by it.
+JWT_ROLE_CLAIM = os.getenv('JWT_ROLE_CLAIM', 'False') == 'True'
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=365),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+TITLES_BULK_MAX_SIZE = 5000
+BULK_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 2000
+IMPORT_CHUNK_SIZE = 10000
+
+PAGINATION_COUNT_CACHE_TIMEOUT = 30
+PAGINATION_ESTIMATE_THRESHOLD = 10000
+
 LEN_EMAIL = 254
 LEN_ROLE = 20
 USER_LEN_NAME = 150
@@ -155,3 +228,11 @@ EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 
 DEFAULT_FROM_EMAIL = 'api@mail.com'
+
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 8
+# Seconds; doubled after every failed attempt up to the maximum.
+EMAIL_OUTBOX_RETRY_DELAY = 30
+EMAIL_OUTBOX_MAX_RETRY_DELAY = 3600
+# Seconds a claimed message stays hidden from other workers.
+EMAIL_OUTBOX_LEASE = 300
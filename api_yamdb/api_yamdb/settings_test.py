@@ -0,0 +1,17 @@
+"""Settings for the test suite (see pytest.ini).
+
+Without a configured database (``DB_NAME``) tests run on SQLite, so
+``pytest`` works without PostgreSQL; set the DB_* variables to run them
+on PostgreSQL instead.
+"""
+from api_yamdb.settings import *  # noqa: F401,F403
+from api_yamdb.settings import BASE_DIR, DATABASES
+
+if not DATABASES['default']['NAME']:
+    DATABASES = {
+        'default': {
+            **DATABASES['default'],
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
+    }
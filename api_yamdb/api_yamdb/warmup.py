@@ -0,0 +1,48 @@
+"""Work done before a gunicorn worker accepts traffic.
+
+``warm_up_app`` runs in the master when the app is preloaded, so its
+results are shared with forked workers copy-on-write. It must not open
+database connections: a socket inherited by several processes breaks.
+``warm_up_worker`` runs in every worker after the fork and connects.
+"""
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver
+from django.utils import translation
+from rest_framework.serializers import BaseSerializer
+
+from api import serializers
+
+
+def build_serializers():
+    """Build the fields of every API serializer once.
+
+    This fills the model ``_meta`` caches and the field mapping lookups
+    the serializers go through on their first request.
+    """
+    for value in vars(serializers).values():
+        if (isinstance(value, type) and issubclass(value, BaseSerializer)
+                and value.__module__ == serializers.__name__):
+            value(context={}).fields
+
+
+def warm_up_app():
+    # Populated on the first reverse() or resolve() otherwise.
+    resolver = get_resolver()
+    resolver.reverse_dict
+    resolver.namespace_dict
+    translation.activate(settings.LANGUAGE_CODE)
+    translation.deactivate()
+    build_serializers()
+
+
+def warm_up_worker(keep=True):
+    """Connect to every database from the worker's main thread.
+
+    Connections belong to a thread, so they are only kept when this
+    thread serves the requests; otherwise this just fails early.
+    """
+    for connection in connections.all():
+        connection.ensure_connection()
+        if not keep:
+            connection.close()
@@ -0,0 +1,64 @@
+"""Gunicorn settings: ``gunicorn -c gunicorn.conf.py``.
+
+Every value can be overridden with a GUNICORN_* environment variable.
+"""
+import gc
+import multiprocessing
+import os
+
+
+def get_cores():
+    try:
+        # Cores this container may use, not all cores of the host.
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return multiprocessing.cpu_count()
+
+
+wsgi_app = 'api_yamdb.wsgi:application'
+bind = os.getenv('GUNICORN_BIND', '0:8000')
+
+# Requests mostly wait on the database and the cache, so two workers per
+# core keep the cores busy. Sync workers serve requests in the thread
+# that was warmed up; with GUNICORN_THREADS > 1 every thread opens its
+# own connection on its first request.
+workers = int(os.getenv('GUNICORN_WORKERS', get_cores() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 1))
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+# Load Django in the master: workers share its memory copy-on-write.
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+
+# Recycle workers to cap memory growth; the jitter keeps them from
+# restarting at the same time.
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 200))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+if os.path.isdir('/dev/shm'):
+    # The heartbeat file is touched constantly; keep it off the disk.
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG')
+
+
+def when_ready(server):
+    if preload_app:
+        from api_yamdb.warmup import warm_up_app
+        warm_up_app()
+        # The collector would otherwise touch, and so copy, every page
+        # of the preloaded objects in each worker.
+        gc.freeze()
+
+
+def post_worker_init(worker):
+    from api_yamdb.warmup import warm_up_app, warm_up_worker
+    if not preload_app:
+        warm_up_app()
+    try:
+        warm_up_worker(keep=threads == 1)
+    except Exception as error:
+        # The first request connects again and reports the error.
+        worker.log.warning('Database warmup failed: %s', error)
@@ -1,13 +1,17 @@
 from django.contrib import admin
-from import_export import resources
 from import_export.admin import ImportExportModelAdmin
 from import_export.fields import Field
-from import_export.widgets import ForeignKeyWidget
 
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.changelist import (AuthorFilter, LargeTableAdminMixin,
+                                ReviewIdFilter, ScoreFilter, TitleIdFilter)
+from reviews.exports import StreamingExportMixin
+from reviews.imports import (BulkModelResource, PreloadedForeignKeyWidget,
+                             batches)
+from reviews.models import Category, Comment, Genre, ImportJob, Review, Title
+from reviews.search import search_titles
 
 
-class GenreResource(resources.ModelResource):
+class GenreResource(BulkModelResource):
 
     class Meta:
         model = Genre
@@ -23,7 +27,7 @@ class GenreAdmin(ImportExportModelAdmin):
     empty_value_display = '-пусто-'
 
 
-class CategoryResource(resources.ModelResource):
+class CategoryResource(BulkModelResource):
 
     class Meta:
         model = Category
@@ -39,18 +43,18 @@ class CategoryAdmin(ImportExportModelAdmin):
     empty_value_display = '-пусто-'
 
 
-class TitleResource(resources.ModelResource):
+class TitleResource(BulkModelResource):
 
     class Meta:
         model = Title
         fields = ('id', 'name', 'year', 'category',)
 
 
-class GenreTitleResource(resources.ModelResource):
+class GenreTitleResource(BulkModelResource):
     title = Field(attribute='title', column_name='title_id',
-                  widget=ForeignKeyWidget(Title))
+                  widget=PreloadedForeignKeyWidget(Title))
     genre = Field(attribute='genre', column_name='genre_id',
-                  widget=ForeignKeyWidget(Genre))
+                  widget=PreloadedForeignKeyWidget(Genre))
 
     class Meta:
         model = Title.genre.through
@@ -66,42 +70,108 @@ class TitleAdmin(ImportExportModelAdmin):
     resource_classes = [TitleResource, GenreTitleResource]
     list_display = ('name', 'year', 'category', 'description',)
     inlines = (GenreTitleInline, )
+    list_select_related = ('category',)
     search_fields = ('name',)
     list_filter = ('name',)
     empty_value_display = '-пусто-'
 
+    def get_search_results(self, request, queryset, search_term):
+        # Full-text index also used by the API, serves the autocomplete
+        # of the review form.
+        if not search_term.strip():
+            return queryset, False
+        return search_titles(queryset, search_term), False
 
-class ReviewResource(resources.ModelResource):
+
+class ReviewResource(BulkModelResource):
     title = Field(attribute='title', column_name='title_id',
-                  widget=ForeignKeyWidget(Title))
+                  widget=PreloadedForeignKeyWidget(Title))
 
     class Meta:
         model = Review
         columns = ['id', 'title_id', 'text', 'author', 'score', 'pub_date', ]
+        # Set on every write, imports do not take it from the file.
+        exclude = ('modified',)
+
+    def before_import(self, dataset, using_transactions, dry_run, **kwargs):
+        self.title_ids = set()
+        super().before_import(dataset, using_transactions, dry_run, **kwargs)
+
+    def after_import_instance(self, instance, new, row_number=None, **kwargs):
+        # The title an updated review is moved away from.
+        if not new:
+            self.title_ids.add(instance.title_id)
+
+    def before_save_instance(self, instance, using_transactions, dry_run):
+        self.title_ids.add(instance.title_id)
+        super().before_save_instance(instance, using_transactions, dry_run)
+
+    def after_import(self, dataset, result, using_transactions, dry_run,
+                     **kwargs):
+        super().after_import(
+            dataset, result, using_transactions, dry_run, **kwargs)
+        # Bulk writes bypass Review.save, which maintains the ratings.
+        if not dry_run:
+            for batch in batches(self.title_ids):
+                Title.objects.filter(pk__in=batch).recalculate_rating()
 
 
 @admin.register(Review)
-class ReviewAdmin(ImportExportModelAdmin):
+class ReviewAdmin(LargeTableAdminMixin, StreamingExportMixin,
+                  ImportExportModelAdmin):
     resource_classes = [ReviewResource]
+    export_select_related = ('title', 'author',)
     list_display = ('title', 'text', 'author', 'pub_date', 'score',)
-    search_fields = ('pub_date',)
-    list_filter = ('pub_date',)
+    list_select_related = ('title', 'author',)
+    search_fields = ('author__username',)
+    list_filter = (AuthorFilter, TitleIdFilter, ScoreFilter, 'pub_date',)
+    autocomplete_fields = ('title', 'author',)
     empty_value_display = '-пусто-'
 
 
-class CommentResource(resources.ModelResource):
+class CommentResource(BulkModelResource):
     review = Field(attribute='review', column_name='review_id',
-                   widget=ForeignKeyWidget(Review))
+                   widget=PreloadedForeignKeyWidget(Review))
 
     class Meta:
         model = Comment
         columns = ('id', 'review_id', 'text', 'author', 'pub_date',)
+        exclude = ('modified',)
 
 
 @admin.register(Comment)
-class CommentAdmin(ImportExportModelAdmin):
+class CommentAdmin(LargeTableAdminMixin, StreamingExportMixin,
+                   ImportExportModelAdmin):
     resource_classes = [CommentResource]
+    export_select_related = ('review', 'author',)
     list_display = ('review', 'text', 'author', 'pub_date',)
-    search_fields = ('author',)
-    list_filter = ('author',)
+    list_select_related = ('review', 'author',)
+    search_fields = ('author__username',)
+    list_filter = (AuthorFilter, ReviewIdFilter, 'pub_date',)
+    autocomplete_fields = ('review', 'author',)
     empty_value_display = '-пусто-'
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    """Large files are imported by ``manage.py process_imports``."""
+    list_display = ('__str__', 'status', 'progress', 'author', 'created',
+                    'finished',)
+    list_filter = ('status', 'resource',)
+    fields = ('resource', 'input_format', 'file', 'status', 'total_rows',
+              'processed_rows', 'errors', 'author', 'created', 'finished',)
+    readonly_fields = ('status', 'total_rows', 'processed_rows', 'errors',
+                       'author', 'created', 'finished',)
+    empty_value_display = '-пусто-'
+
+    @admin.display(description='Прогресс')
+    def progress(self, obj):
+        if not obj.total_rows:
+            return '-'
+        return (f'{obj.processed_rows}/{obj.total_rows} '
+                f'({obj.processed_rows * 100 // obj.total_rows}%)')
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            obj.author = request.user
+        super().save_model(request, obj, form, change)
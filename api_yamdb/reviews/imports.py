@@ -0,0 +1,269 @@
+"""Bulk imports through django-import-export resources.
+
+``BulkModelResource`` is a ``ModelResource`` with batched imports: related
+objects and existing instances are loaded once per batch of ids instead
+of once per row, and rows are written with ``bulk_create`` and
+``bulk_update``. ``run_import_job`` processes an ``ImportJob`` chunk by
+chunk outside the request and records the progress.
+"""
+import functools
+import traceback
+from copy import copy
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from import_export import resources
+from import_export.formats.base_formats import CSV, JSON, XLSX
+from import_export.instance_loaders import ModelInstanceLoader
+from import_export.widgets import ForeignKeyWidget
+from tablib import Dataset
+
+from api.cache import bump_versions
+from api.connections import iter_by_pk, uses_server_side_cursors
+
+IMPORT_RESOURCES = {
+    'category': 'reviews.admin.CategoryResource',
+    'genre': 'reviews.admin.GenreResource',
+    'title': 'reviews.admin.TitleResource',
+    'genre_title': 'reviews.admin.GenreTitleResource',
+    'review': 'reviews.admin.ReviewResource',
+    'comment': 'reviews.admin.CommentResource',
+    'user': 'users.admin.UserResource',
+}
+IMPORT_FORMATS = {'csv': CSV, 'json': JSON, 'xlsx': XLSX}
+
+
+def batches(values, size=None):
+    values = list(values)
+    size = size or settings.BULK_BATCH_SIZE
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def normalize_key(value):
+    # Spreadsheets return whole numbers as floats.
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def is_creation_time(field):
+    return getattr(field, 'auto_now_add', False) or (
+        getattr(field, 'default', None) is timezone.now)
+
+
+class PreloadedForeignKeyWidget(ForeignKeyWidget):
+    """ForeignKeyWidget that resolves values from a map built by
+    ``preload`` with one query per batch of values."""
+    keys = None
+
+    def preload(self, values):
+        values = {normalize_key(value) for value in values
+                  if value not in (None, '')}
+        self.keys = {}
+        for batch in batches(sorted(values)):
+            self.keys.update(
+                (normalize_key(key), pk)
+                for key, pk in self.get_queryset(None, None).filter(
+                    **{f'{self.field}__in': batch}
+                ).values_list(self.field, 'pk')
+            )
+
+    def clean(self, value, row=None, **kwargs):
+        if self.keys is None or self.use_natural_foreign_keys:
+            return super().clean(value, row, **kwargs)
+        if value in (None, ''):
+            return None
+        key = normalize_key(value)
+        if key not in self.keys:
+            raise ValueError(
+                f'{self.model._meta.verbose_name} «{key}» не найден')
+        # Only the key is needed to save the row.
+        fields = {'pk': self.keys[key]}
+        if self.field != 'pk':
+            fields[self.field] = value
+        return self.model(**fields)
+
+
+class BatchedInstanceLoader(ModelInstanceLoader):
+    """Load the instances referenced by the dataset in batches of ids."""
+
+    def __init__(self, resource, dataset=None):
+        super().__init__(resource, dataset)
+        self.pk_field = resource.fields[resource.get_import_id_fields()[0]]
+        self.instances = {}
+        if self.pk_field.column_name not in (dataset.headers or ()):
+            return
+        ids = {normalize_key(value)
+               for value in dataset[self.pk_field.column_name]
+               if value not in (None, '')}
+        for batch in batches(sorted(ids)):
+            for instance in self.get_queryset().filter(
+                    **{f'{self.pk_field.attribute}__in': batch}):
+                self.instances[
+                    normalize_key(self.pk_field.get_value(instance))
+                ] = instance
+
+    def get_instance(self, row):
+        value = row.get(self.pk_field.column_name)
+        if value in (None, ''):
+            return None
+        return self.instances.get(normalize_key(value))
+
+
+class BulkModelResource(resources.ModelResource):
+    """Import rows with batched lookups and bulk writes.
+
+    Bulk writes skip ``save()`` and the model signals, so timestamps are
+    filled here and every cached API response is invalidated after the
+    import. A failed batch is reported as an import error, which rolls
+    the import back.
+    """
+    cache_resources = (
+        'categories', 'genres', 'titles', 'reviews', 'comments')
+
+    class Meta:
+        use_bulk = True
+        batch_size = settings.BULK_BATCH_SIZE
+        instance_loader_class = BatchedInstanceLoader
+
+    def get_chunk_size(self):
+        return settings.EXPORT_CHUNK_SIZE
+
+    def iter_queryset(self, queryset):
+        if (isinstance(queryset, QuerySet)
+                and not queryset._prefetch_related_lookups
+                and not uses_server_side_cursors(queryset)):
+            return iter_by_pk(queryset, self.get_chunk_size())
+        return super().iter_queryset(queryset)
+
+    @classmethod
+    def get_fk_widget(cls, field):
+        return functools.partial(
+            PreloadedForeignKeyWidget, model=field.remote_field.model)
+
+    def before_import(self, dataset, using_transactions, dry_run, **kwargs):
+        self.bulk_errors = []
+        for field in self.get_import_fields():
+            if (isinstance(field.widget, PreloadedForeignKeyWidget)
+                    and field.column_name in (dataset.headers or ())):
+                field.widget.preload(dataset[field.column_name])
+        super().before_import(dataset, using_transactions, dry_run, **kwargs)
+
+    def before_save_instance(self, instance, using_transactions, dry_run):
+        now = timezone.now()
+        for field in instance._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or (
+                    is_creation_time(field)
+                    and getattr(instance, field.attname) is None):
+                setattr(instance, field.attname, now)
+        super().before_save_instance(instance, using_transactions, dry_run)
+
+    def get_bulk_update_fields(self):
+        fields = super().get_bulk_update_fields()
+        return fields + [
+            field.name for field in self._meta.model._meta.concrete_fields
+            if getattr(field, 'auto_now', False) and field.name not in fields
+        ]
+
+    def run_bulk(self, instances, write, raise_errors):
+        try:
+            with transaction.atomic(using=self.get_db_connection_name()):
+                write(instances)
+        except Exception as error:
+            if raise_errors:
+                raise
+            self.bulk_errors.append(self.get_error_result_class()(
+                error, traceback.format_exc()))
+        finally:
+            instances.clear()
+
+    def bulk_create(self, using_transactions, dry_run, raise_errors,
+                    batch_size=None):
+        if not using_transactions and dry_run:
+            self.create_instances.clear()
+            return
+        self.run_bulk(
+            self.create_instances,
+            lambda instances: self._meta.model.objects.bulk_create(
+                instances, batch_size=batch_size),
+            raise_errors
+        )
+
+    def bulk_update(self, using_transactions, dry_run, raise_errors,
+                    batch_size=None):
+        if not using_transactions and dry_run:
+            self.update_instances.clear()
+            return
+        self.run_bulk(
+            self.update_instances,
+            lambda instances: self._meta.model.objects.bulk_update(
+                instances, self.get_bulk_update_fields(),
+                batch_size=batch_size),
+            raise_errors
+        )
+
+    def after_import(self, dataset, result, using_transactions, dry_run,
+                     **kwargs):
+        for error in self.bulk_errors:
+            result.append_base_error(error)
+        super().after_import(
+            dataset, result, using_transactions, dry_run, **kwargs)
+        if not dry_run and not result.has_errors():
+            transaction.on_commit(
+                lambda: bump_versions(*self.cache_resources))
+
+
+def read_dataset(job):
+    input_format = IMPORT_FORMATS[job.input_format]()
+    with job.file.open('rb') as file:
+        content = file.read()
+    if not input_format.is_binary():
+        content = content.decode('utf-8-sig')
+    return input_format.create_dataset(content)
+
+
+def describe_errors(result, offset):
+    for error in result.base_errors:
+        yield (f'Строки {offset + 1}-{offset + result.total_rows}: '
+               f'{error.error}')
+    for number, row_errors in result.row_errors():
+        for error in row_errors:
+            yield f'Строка {offset + number}: {error.error}'
+    for row in result.invalid_rows:
+        yield f'Строка {offset + row.number}: {row.error_dict}'
+
+
+def run_import_job(job):
+    """Import ``job.file`` in chunks, saving the progress after each.
+
+    Every chunk is imported in its own transaction, so a failed chunk
+    is rolled back alone and reported in ``job.errors``.
+    """
+    from reviews.models import ImportJob
+
+    resource = import_string(IMPORT_RESOURCES[job.resource])()
+    # The per-row diff is only useful for the admin preview.
+    resource._meta = copy(resource._meta)
+    resource._meta.skip_diff = True
+    dataset = read_dataset(job)
+    job.total_rows = len(dataset)
+    job.status = ImportJob.RUNNING
+    job.save(update_fields=('total_rows', 'status'))
+    errors = []
+    chunk_size = settings.IMPORT_CHUNK_SIZE
+    for start in range(0, len(dataset), chunk_size):
+        chunk = Dataset(*dataset[start:start + chunk_size],
+                        headers=dataset.headers)
+        result = resource.import_data(chunk, use_transactions=True)
+        errors.extend(describe_errors(result, start))
+        job.processed_rows = start + len(chunk)
+        job.save(update_fields=('processed_rows',))
+    job.errors = '\n'.join(errors)
+    job.status = ImportJob.FAILED if errors else ImportJob.DONE
+    job.finished = timezone.now()
+    job.save(update_fields=('errors', 'status', 'finished'))
+    return job
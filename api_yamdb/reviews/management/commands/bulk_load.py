@@ -0,0 +1,243 @@
+import csv
+import io
+import json
+import os
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from api.cache import bump_versions
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+# Model, CSV column -> model attribute, foreign keys:
+# attribute -> (related model, field used for non-numeric values).
+SPECS = {
+    'category': (Category, {'id': 'id', 'name': 'name', 'slug': 'slug'}, {}),
+    'genre': (Genre, {'id': 'id', 'name': 'name', 'slug': 'slug'}, {}),
+    'title': (
+        Title,
+        {'id': 'id', 'name': 'name', 'year': 'year',
+         'description': 'description', 'category': 'category_id'},
+        {'category_id': (Category, 'slug')},
+    ),
+    'genre_title': (
+        Title.genre.through,
+        {'id': 'id', 'title_id': 'title_id', 'genre_id': 'genre_id'},
+        {'title_id': (Title, None), 'genre_id': (Genre, 'slug')},
+    ),
+    'review': (
+        Review,
+        {'id': 'id', 'title_id': 'title_id', 'text': 'text',
+         'author': 'author_id', 'score': 'score', 'pub_date': 'pub_date'},
+        {'title_id': (Title, None), 'author_id': (User, 'username')},
+    ),
+    'comment': (
+        Comment,
+        {'id': 'id', 'review_id': 'review_id', 'text': 'text',
+         'author': 'author_id', 'pub_date': 'pub_date'},
+        {'review_id': (Review, None), 'author_id': (User, 'username')},
+    ),
+    'user': (
+        User,
+        {'id': 'id', 'username': 'username', 'email': 'email',
+         'role': 'role', 'bio': 'bio', 'first_name': 'first_name',
+         'last_name': 'last_name'},
+        {},
+    ),
+}
+
+
+def iter_json_array(file, buffer_size=1 << 16):
+    """Yield the objects of a top-level JSON array without loading it."""
+    decoder = json.JSONDecoder()
+    buffer = file.read(buffer_size).lstrip()
+    if not buffer.startswith('['):
+        raise CommandError('Ожидается JSON-массив объектов')
+    buffer = buffer[1:]
+    while True:
+        buffer = buffer.lstrip().lstrip(',').lstrip()
+        if buffer.startswith(']'):
+            return
+        try:
+            obj, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            chunk = file.read(buffer_size)
+            if not chunk:
+                raise CommandError('Файл JSON оборван')
+            buffer += chunk
+            continue
+        yield obj
+        buffer = buffer[end:]
+        if len(buffer) < buffer_size:
+            buffer += file.read(buffer_size)
+
+
+def iter_rows(file, file_format):
+    if file_format == 'csv':
+        return csv.DictReader(file)
+    if file_format == 'ndjson':
+        return (json.loads(line) for line in file if line.strip())
+    return iter_json_array(file)
+
+
+def copy_sql_value(value):
+    # NULL is an unquoted empty field, everything else is quoted.
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        value = 't' if value else 'f'
+    return '"{}"'.format(str(value).replace('"', '""'))
+
+
+class Command(BaseCommand):
+    help = ('Потоково загружает CSV/JSON/NDJSON в базу пачками через '
+            'bulk_create (COPY на PostgreSQL)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=sorted(SPECS))
+        parser.add_argument('path')
+        parser.add_argument(
+            '--format', choices=('csv', 'json', 'ndjson'),
+            help='По умолчанию определяется по расширению файла')
+        parser.add_argument('--chunk-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        model, columns, foreign_keys = SPECS[options['model']]
+        file_format = options['format'] or {
+            '.csv': 'csv', '.json': 'json', '.jsonl': 'ndjson',
+            '.ndjson': 'ndjson',
+        }.get(os.path.splitext(options['path'])[1].lower())
+        if file_format is None:
+            raise CommandError('Не удалось определить формат файла')
+        self.fk_maps = {
+            attname: self.load_fk_map(related, lookup)
+            for attname, (related, lookup) in foreign_keys.items()
+        }
+        loaded = skipped = 0
+        with open(options['path'], encoding='utf-8', newline='') as file:
+            rows = iter_rows(file, file_format)
+            while True:
+                chunk = list(islice(rows, options['chunk_size']))
+                if not chunk:
+                    break
+                objs = []
+                for row in chunk:
+                    obj = self.build_object(model, columns, row)
+                    if obj is None:
+                        skipped += 1
+                    else:
+                        objs.append(obj)
+                with transaction.atomic():
+                    self.insert(model, objs)
+                loaded += len(objs)
+                self.stdout.write(f'Загружено: {loaded}, пропущено: {skipped}')
+        self.finish(model)
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово: загружено {loaded}, пропущено {skipped}'))
+
+    def load_fk_map(self, related, lookup):
+        """Preload the ids and the slugs or usernames of the related model.
+
+        They are kept apart, so a username "42" does not shadow the user
+        with id 42.
+        """
+        ids = set(related.objects.values_list('id', flat=True).iterator())
+        keys = {}
+        if lookup is not None:
+            keys = dict(related.objects.values_list(lookup, 'id').iterator())
+        return ids, keys
+
+    def resolve_fk(self, attname, value):
+        """Numeric values are ids, other values are slugs or usernames."""
+        ids, keys = self.fk_maps[attname]
+        if isinstance(value, int) or str(value).isdecimal():
+            value = int(value)
+            return value if value in ids else None
+        return keys.get(str(value))
+
+    def build_object(self, model, columns, row):
+        """Build an unsaved instance, or return None if a required
+        related object is missing."""
+        values = {}
+        for column, attname in columns.items():
+            value = row.get(column)
+            if value in (None, ''):
+                if model._meta.get_field(attname).null:
+                    continue
+                if attname in self.fk_maps:
+                    return None
+                continue
+            if attname in self.fk_maps:
+                value = self.resolve_fk(attname, value)
+                if value is None:
+                    return None
+            values[attname] = value
+        if 'pub_date' in columns.values():
+            values['pub_date'] = self.parse_date(values.get('pub_date'))
+        return model(**values)
+
+    def parse_date(self, value):
+        if isinstance(value, str):
+            value = parse_datetime(value)
+        if value is None:
+            return timezone.now()
+        if timezone.is_naive(value):
+            return timezone.make_aware(value)
+        return value
+
+    def insert(self, model, objs):
+        if connection.vendor != 'postgresql':
+            model.objects.bulk_create(objs)
+            return
+        # COPY has one column list: rows with and without an id are
+        # copied separately. The latter take their ids from the sequence,
+        # which is moved past the copied ids first.
+        with_pk = [obj for obj in objs if obj.pk is not None]
+        without_pk = [obj for obj in objs if obj.pk is None]
+        if with_pk:
+            self.copy(model, with_pk, model._meta.concrete_fields)
+        if without_pk:
+            if with_pk:
+                self.reset_sequence(model)
+            self.copy(model, without_pk, [
+                field for field in model._meta.concrete_fields
+                if not field.primary_key
+            ])
+
+    def copy(self, model, objs, fields):
+        buffer = io.StringIO()
+        for obj in objs:
+            buffer.write(','.join(
+                copy_sql_value(field.get_db_prep_save(
+                    field.pre_save(obj, add=True), connection))
+                for field in fields
+            ))
+            buffer.write('\n')
+        buffer.seek(0)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                'COPY {} ({}) FROM STDIN WITH (FORMAT csv)'.format(
+                    connection.ops.quote_name(model._meta.db_table),
+                    ', '.join(connection.ops.quote_name(field.column)
+                              for field in fields)
+                ),
+                buffer
+            )
+
+    def reset_sequence(self, model):
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [model]):
+                cursor.execute(sql)
+
+    def finish(self, model):
+        """Rebuild derived data that bulk inserts do not maintain."""
+        self.reset_sequence(model)
+        if model in (Review, Title):
+            Title.objects.recalculate_rating()
+        bump_versions(
+            'categories', 'genres', 'titles', 'reviews', 'comments')
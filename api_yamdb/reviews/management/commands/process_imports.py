@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from reviews.imports import run_import_job
+from reviews.models import ImportJob
+
+
+def claim_job():
+    """Mark the oldest pending job as running and return it."""
+    with transaction.atomic():
+        job = ImportJob.objects.select_for_update(skip_locked=True).filter(
+            status=ImportJob.PENDING
+        ).order_by('created').first()
+        if job is not None:
+            job.status = ImportJob.RUNNING
+            job.save(update_fields=('status',))
+    return job
+
+
+class Command(BaseCommand):
+    help = 'Выполняет импорты из очереди, созданные в админке'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Обработать очередь и завершиться')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза между проверками очереди, секунды')
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_job()
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
+                continue
+            self.stdout.write(f'Импорт {job.pk}: {job}')
+            try:
+                run_import_job(job)
+            except Exception as error:
+                job.status = ImportJob.FAILED
+                job.errors = str(error)
+                job.finished = timezone.now()
+                job.save(update_fields=('status', 'errors', 'finished'))
+                self.stderr.write(f'Импорт {job.pk} не выполнен: {error}')
+                continue
+            self.stdout.write(self.style.SUCCESS(
+                f'Импорт {job.pk}: обработано {job.processed_rows} '
+                f'из {job.total_rows}, статус «{job.get_status_display()}»'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.cache import bump_versions
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рейтинги произведений по таблице отзывов'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = Title.objects.recalculate_rating()
+        bump_versions('titles')
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитан рейтинг произведений: {updated}'))
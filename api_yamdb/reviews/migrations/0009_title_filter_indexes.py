@@ -0,0 +1,25 @@
+# Generated by Django 3.2 on 2026-10-18 04:31
+
+from django.db import migrations, models
+
+import reviews.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_title_search'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='title',
+            name='year',
+            field=models.PositiveSmallIntegerField(db_index=True, validators=[reviews.validators.validate_year], verbose_name='Год выпуска'),
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX reviews_title_genre_genre_title_idx '
+            'ON reviews_title_genre (genre_id, title_id)',
+            'DROP INDEX reviews_title_genre_genre_title_idx',
+        ),
+    ]
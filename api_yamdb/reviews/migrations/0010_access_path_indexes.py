@@ -0,0 +1,33 @@
+# Generated by Django 3.2 on 2026-10-18 04:32
+
+from django.db import migrations, models
+
+from reviews.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('reviews', '0009_title_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='review',
+            options={'default_related_name': 'reviews', 'ordering': ('-pub_date', '-id'), 'verbose_name': 'Отзыв', 'verbose_name_plural': 'Отзывы'},
+        ),
+        AddIndexConcurrently(
+            model_name='comment',
+            index=models.Index(fields=['review', 'pub_date', 'id'], name='comment_review_pub_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='review',
+            index=models.Index(fields=['title', '-pub_date', '-id'], name='review_title_pub_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='title',
+            index=models.Index(fields=['category', 'id'], name='title_category_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.2 on 2026-10-18 04:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('reviews', '0011_title_modified'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(choices=[('category', 'Категории'), ('genre', 'Жанры'), ('title', 'Произведения'), ('genre_title', 'Жанры произведений'), ('user', 'Пользователи'), ('review', 'Отзывы'), ('comment', 'Комментарии')], max_length=20, verbose_name='Данные')),
+                ('input_format', models.CharField(choices=[('csv', 'CSV'), ('json', 'JSON'), ('xlsx', 'XLSX')], default='csv', max_length=10, verbose_name='Формат')),
+                ('file', models.FileField(upload_to='imports/', verbose_name='Файл')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('running', 'Выполняется'), ('done', 'Завершён'), ('failed', 'Завершён с ошибками')], db_index=True, default='pending', max_length=10, verbose_name='Статус')),
+                ('total_rows', models.PositiveIntegerField(default=0, verbose_name='Всего строк')),
+                ('processed_rows', models.PositiveIntegerField(default=0, verbose_name='Обработано строк')),
+                ('errors', models.TextField(blank=True, verbose_name='Ошибки')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Создан')),
+                ('finished', models.DateTimeField(blank=True, null=True, verbose_name='Завершён')),
+                ('author', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='автор')),
+            ],
+            options={
+                'verbose_name': 'Импорт',
+                'verbose_name_plural': 'Импорты',
+                'ordering': ('-created',),
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 3.2 on 2026-10-18 05:16
+
+from django.db import migrations, models
+from django.db.models import FloatField
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+
+def fill_rating_key(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Title.objects.update(rating_key=Coalesce(
+        Cast('rating_sum', FloatField()) / NullIf('rating_count', 0), 0.0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_importjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating_key',
+            field=models.FloatField(default=0, editable=False, verbose_name='Рейтинг для сортировки'),
+        ),
+        migrations.RunPython(fill_rating_key, migrations.RunPython.noop),
+    ]
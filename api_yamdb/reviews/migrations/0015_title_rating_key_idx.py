@@ -0,0 +1,21 @@
+# Generated by Django 3.2 on 2026-10-18 06:02
+
+from django.db import migrations, models
+
+from reviews.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('reviews', '0014_pub_date_default'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='title',
+            index=models.Index(fields=['-rating_key', 'id'], name='title_rating_key_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.2 on 2026-10-18 06:14
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_modified(apps, schema_editor):
+    for model_name in ('Review', 'Comment'):
+        model = apps.get_model('reviews', model_name)
+        model.objects.update(modified=F('pub_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0015_title_rating_key_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата изменения'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата изменения'),
+        ),
+        migrations.RunPython(fill_modified, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2 on 2026-10-18 06:14
+
+from django.db import migrations, models
+
+from reviews.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('reviews', '0016_review_comment_modified'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='comment',
+            index=models.Index(fields=['modified'], name='comment_modified_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='review',
+            index=models.Index(fields=['modified'], name='review_modified_idx'),
+        ),
+    ]
@@ -1,6 +1,9 @@
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
 
 from reviews.validators import validate_year
 from users.models import User
@@ -32,11 +35,62 @@ class Category(BaseGenreCategory):
         verbose_name_plural = 'Категории'
 
 
+def get_rating_key(rating_sum, rating_count):
+    """Average score as a stored sort key, 0 for titles without reviews.
+
+    Scores start at 1, so unrated titles come last in descending order.
+    """
+    return Coalesce(
+        Cast(rating_sum, models.FloatField()) / NullIf(rating_count, 0),
+        0.0
+    )
+
+
+class TitleQuerySet(models.QuerySet):
+
+    def with_rating(self):
+        """Annotate the average score from the denormalized counters."""
+        return self.annotate(rating=Cast(
+            'rating_sum', models.FloatField()
+        ) / NullIf('rating_count', 0))
+
+    def change_rating(self, score_delta, count_delta):
+        return self.update(
+            rating_sum=F('rating_sum') + score_delta,
+            rating_count=F('rating_count') + count_delta,
+            # The right-hand sides see the values before the update.
+            rating_key=get_rating_key(
+                F('rating_sum') + score_delta,
+                F('rating_count') + count_delta,
+            ),
+            modified=timezone.now(),
+        )
+
+    def recalculate_rating(self):
+        """Rebuild the rating counters from the reviews table."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        with transaction.atomic(using=self.db):
+            updated = self.update(
+                rating_sum=Coalesce(Subquery(
+                    reviews.annotate(total=Sum('score')).values('total')
+                ), 0),
+                rating_count=Coalesce(Subquery(
+                    reviews.annotate(total=Count('pk')).values('total')
+                ), 0),
+                modified=timezone.now(),
+            )
+            self.update(
+                rating_key=get_rating_key('rating_sum', 'rating_count'))
+        return updated
+
+
 class Title(models.Model):
     name = models.CharField(
         'Название произведения', max_length=settings.NAME_LEN,)
     year = models.PositiveSmallIntegerField(
-        'Год выпуска', validators=(validate_year,)
+        'Год выпуска', validators=(validate_year,), db_index=True
     )
     genre = models.ManyToManyField(
         Genre,
@@ -56,14 +110,55 @@ class Title(models.Model):
         blank=True,
         null=True
     )
+    rating_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+        editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        'Количество отзывов',
+        default=0,
+        editable=False
+    )
+    rating_key = models.FloatField(
+        'Рейтинг для сортировки',
+        default=0,
+        editable=False
+    )
+
+    modified = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True,
+        db_index=True
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(
+                fields=('category', 'id'), name='title_category_idx'),
+            models.Index(
+                fields=('-rating_key', 'id'), name='title_rating_key_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # Rating counters are only changed with F() updates by reviews,
+        # so an edit of the title must not write back stale values.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            skipped = self.get_deferred_fields() | {
+                'rating_sum', 'rating_count', 'rating_key'}
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skipped
+            ]
+        super().save(*args, **kwargs)
+
 
 class BaseReviewComment(models.Model):
     text = models.TextField(
@@ -74,10 +169,17 @@ class BaseReviewComment(models.Model):
         on_delete=models.CASCADE,
         verbose_name='автор'
     )
+    # Not auto_now_add: imports store the original dates through the
+    # usual save paths.
     pub_date = models.DateTimeField(
         'Дата',
         db_index=True,
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
+    )
+    modified = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True
     )
 
     def __str__(self):
@@ -106,13 +208,41 @@ class Review(BaseReviewComment):
     class Meta:
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
-        ordering = ('-pub_date',)
+        ordering = ('-pub_date', '-id')
         default_related_name = 'reviews'
         constraints = [
             models.UniqueConstraint(
                 fields=('author', 'title',),
                 name='unique_review')
         ]
+        indexes = [
+            models.Index(
+                fields=('title', '-pub_date', '-id'),
+                name='review_title_pub_date_idx'),
+            models.Index(fields=('modified',), name='review_modified_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                previous = Review.objects.select_for_update().filter(
+                    pk=self.pk
+                ).values_list('title_id', 'score').first()
+            super().save(*args, **kwargs)
+            if previous is None:
+                Title.objects.filter(pk=self.title_id).change_rating(
+                    self.score, 1)
+            elif previous[0] != self.title_id:
+                Title.objects.filter(pk=previous[0]).change_rating(
+                    -previous[1], -1)
+                Title.objects.filter(pk=self.title_id).change_rating(
+                    self.score, 1)
+            else:
+                # The rating changes, so this also moves Title.modified
+                # for incremental exports.
+                Title.objects.filter(pk=self.title_id).change_rating(
+                    self.score - previous[1], 0)
 
 
 class Comment(BaseReviewComment):
@@ -127,3 +257,67 @@ class Comment(BaseReviewComment):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
+        indexes = [
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'),
+            models.Index(fields=('modified',), name='comment_modified_idx'),
+        ]
+
+
+class ImportJob(models.Model):
+    """A file queued for import by the ``process_imports`` worker."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Завершён'),
+        (FAILED, 'Завершён с ошибками'),
+    ]
+    RESOURCE_CHOICES = [
+        ('category', 'Категории'),
+        ('genre', 'Жанры'),
+        ('title', 'Произведения'),
+        ('genre_title', 'Жанры произведений'),
+        ('user', 'Пользователи'),
+        ('review', 'Отзывы'),
+        ('comment', 'Комментарии'),
+    ]
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('json', 'JSON'),
+        ('xlsx', 'XLSX'),
+    ]
+
+    resource = models.CharField(
+        'Данные', max_length=20, choices=RESOURCE_CHOICES)
+    input_format = models.CharField(
+        'Формат', max_length=10, choices=FORMAT_CHOICES, default='csv')
+    file = models.FileField('Файл', upload_to='imports/')
+    status = models.CharField(
+        'Статус', max_length=10, choices=STATUS_CHOICES, default=PENDING,
+        db_index=True)
+    total_rows = models.PositiveIntegerField('Всего строк', default=0)
+    processed_rows = models.PositiveIntegerField('Обработано строк',
+                                                 default=0)
+    errors = models.TextField('Ошибки', blank=True)
+    author = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name='автор'
+    )
+    created = models.DateTimeField('Создан', auto_now_add=True)
+    finished = models.DateTimeField('Завершён', null=True, blank=True)
+
+    class Meta:
+        ordering = ('-created',)
+        verbose_name = 'Импорт'
+        verbose_name_plural = 'Импорты'
+
+    def __str__(self):
+        return f'{self.get_resource_display()}: {self.file.name}'
@@ -0,0 +1,32 @@
+from django.db.migrations.operations import AddIndex
+
+
+class AddIndexConcurrently(AddIndex):
+    """Add an index without blocking writes on PostgreSQL.
+
+    Other backends build the index the usual way. Migrations using this
+    operation must set ``atomic = False``.
+    """
+
+    def _index_kwargs(self, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            return {'concurrently': True}
+        return {}
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(
+                model, self.index, **self._index_kwargs(schema_editor))
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(
+                model, self.index, **self._index_kwargs(schema_editor))
+
+    def describe(self):
+        return 'Concurrently create index {} on {}'.format(
+            self.index.name, self.model_name)
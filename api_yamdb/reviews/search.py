@@ -0,0 +1,129 @@
+"""Indexed full-text search over title name and description.
+
+Postgres keeps a generated ``tsvector`` column with a GIN index plus
+a trigram index on the name; SQLite uses an external content FTS5 table
+kept in sync by triggers. Other backends fall back to ``icontains``.
+"""
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+POSTGRES_SEARCH_SQL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE reviews_title ADD COLUMN IF NOT EXISTS search_vector "
+    "tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS reviews_title_search_idx "
+    "ON reviews_title USING GIN (search_vector)",
+    "CREATE INDEX IF NOT EXISTS reviews_title_name_trgm_idx "
+    "ON reviews_title USING GIN (name gin_trgm_ops)",
+)
+POSTGRES_DROP_SEARCH_SQL = (
+    "DROP INDEX IF EXISTS reviews_title_name_trgm_idx",
+    "DROP INDEX IF EXISTS reviews_title_search_idx",
+    "ALTER TABLE reviews_title DROP COLUMN IF EXISTS search_vector",
+)
+SQLITE_SEARCH_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS reviews_title_fts USING fts5("
+    "name, description, content='reviews_title', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS reviews_title_fts_insert "
+    "AFTER INSERT ON reviews_title BEGIN "
+    "INSERT INTO reviews_title_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS reviews_title_fts_delete "
+    "AFTER DELETE ON reviews_title BEGIN "
+    "INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name, "
+    "description) VALUES ('delete', old.id, old.name, old.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS reviews_title_fts_update "
+    "AFTER UPDATE OF name, description ON reviews_title BEGIN "
+    "INSERT INTO reviews_title_fts(reviews_title_fts, rowid, name, "
+    "description) VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO reviews_title_fts(rowid, name, description) "
+    "VALUES (new.id, new.name, new.description); END",
+    "INSERT INTO reviews_title_fts(reviews_title_fts) VALUES ('rebuild')",
+)
+SQLITE_DROP_SEARCH_SQL = (
+    "DROP TRIGGER IF EXISTS reviews_title_fts_update",
+    "DROP TRIGGER IF EXISTS reviews_title_fts_delete",
+    "DROP TRIGGER IF EXISTS reviews_title_fts_insert",
+    "DROP TABLE IF EXISTS reviews_title_fts",
+)
+
+
+def _execute(connection, statements):
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def install_search_index(connection):
+    """Create the search index for the connection vendor, if supported.
+
+    The statements are idempotent. On SQLite the triggers are dropped
+    whenever Django rebuilds ``reviews_title`` during a migration, so
+    this also runs after every ``migrate``.
+    """
+    if connection.vendor == 'postgresql':
+        _execute(connection, POSTGRES_SEARCH_SQL)
+    elif connection.vendor == 'sqlite':
+        _execute(connection, SQLITE_SEARCH_SQL)
+
+
+def uninstall_search_index(connection):
+    if connection.vendor == 'postgresql':
+        _execute(connection, POSTGRES_DROP_SEARCH_SQL)
+    elif connection.vendor == 'sqlite':
+        _execute(connection, SQLITE_DROP_SEARCH_SQL)
+
+
+def _fts5_query(query):
+    # Every word is quoted, so user input can not use FTS5 syntax,
+    # and matched as a prefix.
+    return ' '.join(
+        '"{}"*'.format(word.replace('"', '""')) for word in query.split()
+    )
+
+
+def search_titles(queryset, query):
+    """Filter titles by ``query`` and order them by relevance."""
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        queryset = queryset.annotate(
+            search_match=RawSQL(
+                "reviews_title.search_vector @@ "
+                "websearch_to_tsquery('russian', %s) "
+                "OR reviews_title.name %% %s",
+                (query, query),
+                output_field=BooleanField()
+            ),
+            search_rank=RawSQL(
+                "ts_rank(reviews_title.search_vector, "
+                "websearch_to_tsquery('russian', %s)) "
+                "+ similarity(reviews_title.name, %s)",
+                (query, query),
+                output_field=FloatField()
+            ),
+        ).filter(search_match=True)
+    elif vendor == 'sqlite':
+        fts_query = _fts5_query(query)
+        if not fts_query:
+            return queryset.none()
+        queryset = queryset.filter(pk__in=RawSQL(
+            "SELECT rowid FROM reviews_title_fts "
+            "WHERE reviews_title_fts MATCH %s",
+            (fts_query,)
+        )).annotate(search_rank=RawSQL(
+            "SELECT -bm25(reviews_title_fts, 10.0, 1.0) "
+            "FROM reviews_title_fts WHERE reviews_title_fts MATCH %s "
+            "AND rowid = reviews_title.id",
+            (fts_query,),
+            output_field=FloatField()
+        ))
+    else:
+        queryset = queryset.filter(
+            Q(name__icontains=query) | Q(description__icontains=query)
+        ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+    return queryset.order_by('-search_rank', 'pk')
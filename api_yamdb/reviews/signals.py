@@ -0,0 +1,22 @@
+from django.db import connections
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from reviews.models import Review, Title
+from reviews.search import install_search_index
+
+
+@receiver(post_delete, sender=Review)
+def decrease_title_rating(sender, instance, **kwargs):
+    """Keep the rating counters in sync, including cascade deletes."""
+    Title.objects.filter(pk=instance.title_id).change_rating(
+        -instance.score, -1)
+
+
+def restore_search_index(sender, using, **kwargs):
+    """Recreate SQLite search triggers lost when a migration remakes
+    the titles table."""
+    connection = connections[using]
+    if (connection.vendor == 'sqlite' and 'reviews_title_fts'
+            in connection.introspection.table_names()):
+        install_search_index(connection)
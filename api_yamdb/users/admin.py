@@ -1,11 +1,15 @@
 from django.contrib import admin
-from import_export import resources
 from import_export.admin import ImportExportModelAdmin
 
-from users.models import User
+from reviews.changelist import LargeTableAdminMixin
+from reviews.exports import StreamingExportMixin
+from reviews.imports import BulkModelResource
+from users.models import OutboxEmail, User
 
 
-class UserResource(resources.ModelResource):
+class UserResource(BulkModelResource):
+    # Bulk writes skip the signals that invalidate authenticated users.
+    cache_resources = BulkModelResource.cache_resources + ('users',)
 
     class Meta:
         model = User
@@ -21,7 +25,8 @@ class UserResource(resources.ModelResource):
 
 
 @admin.register(User)
-class UserAdmin(ImportExportModelAdmin):
+class UserAdmin(LargeTableAdminMixin, StreamingExportMixin,
+                ImportExportModelAdmin):
     resource_classes = [UserResource]
     list_display = (
         'id',
@@ -32,6 +37,17 @@ class UserAdmin(ImportExportModelAdmin):
         'bio',
         'role',
     )
-    search_fields = ('username',)
-    list_filter = ('username',)
+    search_fields = ('username', 'email',)
+    list_filter = ('role', 'is_staff',)
+    empty_value_display = '-пусто-'
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    """Messages are sent by ``manage.py send_outbox``."""
+    list_display = ('to', 'subject', 'status', 'attempts', 'next_attempt',
+                    'created', 'sent',)
+    list_filter = ('status',)
+    search_fields = ('to',)
+    readonly_fields = ('attempts', 'last_error', 'created', 'sent',)
     empty_value_display = '-пусто-'
@@ -0,0 +1,169 @@
+"""JWT authentication that does not read the user row on every request.
+
+Users are kept in a bounded per-process LRU with a time to live. Every
+entry is stored with the user's version token (see ``api.cache``), which
+is bumped when the user is saved or deleted, so a change made in one
+worker is seen by the others through the shared cache.
+
+With ``JWT_ROLE_CLAIM`` tokens also carry the role, and safe requests
+are authenticated from the claims alone while the token's version still
+matches the user's.
+
+Both need a cache shared by the workers: with a process-local one a
+bump would not reach the other workers, so users are read on every
+request and role claims are ignored (``users.checks`` reports it).
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.cache import bump_versions, get_versions, is_cache_shared
+from users.models import User
+
+ROLE_CLAIMS = ('role', 'is_superuser', 'is_staff')
+VERSION_CLAIM = 'user_version'
+
+
+def get_user_version(user_id):
+    return '|'.join(get_versions('users', f'user-{user_id}'))
+
+
+def invalidate_user(user_id):
+    user_cache.delete(user_id)
+    bump_versions(f'user-{user_id}')
+
+
+class UserCache:
+    """Bounded LRU of users with a time to live."""
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id, version):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            user, entry_version, expires = entry
+            if entry_version != version or expires < time.monotonic():
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+        # Requests may change their user, the cached one stays intact.
+        return copy.copy(user)
+
+    def set(self, user_id, user, version):
+        with self.lock:
+            self.entries[user_id] = (
+                copy.copy(user), version,
+                time.monotonic() + settings.AUTH_USER_CACHE_TIMEOUT)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > settings.AUTH_USER_CACHE_SIZE:
+                self.entries.popitem(last=False)
+
+    def delete(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserCache()
+
+
+class ClaimsUser:
+    """A principal built from the role claims of a token.
+
+    Role checks read the claims; any other attribute loads the user row.
+    """
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+    USER = User.USER
+    MODERATOR = User.MODERATOR
+    ADMIN = User.ADMIN
+    is_admin = User.is_admin
+    is_moderator = User.is_moderator
+
+    def __init__(self, token, load_user):
+        self.pk = self.id = token[api_settings.USER_ID_CLAIM]
+        for claim in ROLE_CLAIMS:
+            setattr(self, claim, token[claim])
+        self._load_user = load_user
+
+    def get_user(self):
+        if '_user' not in self.__dict__:
+            self._user = self._load_user()
+        return self._user
+
+    def __getattr__(self, name):
+        # Private attributes (such as the roles memo of api.permissions)
+        # are never read from the user row.
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.get_user(), name)
+
+    def __str__(self):
+        return str(self.get_user())
+
+
+def get_access_token(user):
+    token = AccessToken.for_user(user)
+    if settings.JWT_ROLE_CLAIM:
+        for claim in ROLE_CLAIMS:
+            token[claim] = getattr(user, claim)
+        token[VERSION_CLAIM] = get_user_version(user.pk)
+    return token
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if request.method in SAFE_METHODS:
+            user = self.get_claims_user(validated_token)
+            if user is not None:
+                return user, validated_token
+        return self.get_user(validated_token), validated_token
+
+    def get_claims_user(self, validated_token):
+        if not (settings.JWT_ROLE_CLAIM and is_cache_shared()
+                and VERSION_CLAIM in validated_token):
+            return None
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if validated_token[VERSION_CLAIM] != get_user_version(user_id):
+            return None
+        return ClaimsUser(
+            validated_token, lambda: self.get_user(validated_token))
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Токен не содержит идентификатора пользователя')
+        if not is_cache_shared():
+            return super().get_user(validated_token)
+        version = get_user_version(user_id)
+        user = user_cache.get(user_id, version)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user, version)
+        return user
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+from api.cache import is_cache_shared
+
+
+@register()
+def check_role_claim_cache(app_configs, **kwargs):
+    if settings.JWT_ROLE_CLAIM and not is_cache_shared():
+        return [Error(
+            'JWT_ROLE_CLAIM требует кэша, общего для всех воркеров: '
+            'иначе смена роли не доходит до других процессов',
+            hint='Укажите CACHE_BACKEND, например FileBasedCache или Redis',
+            id='users.E001',
+        )]
+    return []
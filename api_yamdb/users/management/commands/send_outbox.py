@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.outbox import send_outbox
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди исходящих'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Отправить накопившиеся письма и завершиться')
+        parser.add_argument(
+            '--interval', type=float, default=2,
+            help='Пауза между проверками очереди, секунды')
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent, failed = send_outbox()
+            except Exception as error:
+                self.stderr.write(f'Почтовый сервер недоступен: {error}')
+                sent = failed = 0
+            if sent or failed:
+                self.stdout.write(
+                    f'Отправлено писем: {sent}, отложено: {failed}')
+            if options['once']:
+                return
+            time.sleep(options['interval'])
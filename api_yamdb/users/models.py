@@ -2,6 +2,7 @@ from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.db import models
+from django.utils.timezone import now
 
 from users.validators import validate_me_name
 
@@ -68,3 +69,39 @@ class User(AbstractUser):
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
+
+
+class OutboxEmail(models.Model):
+    """A message queued for the ``send_outbox`` worker."""
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'В очереди'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не отправлено'),
+    ]
+
+    subject = models.CharField('Тема', max_length=255)
+    body = models.TextField('Текст')
+    from_email = models.CharField('Отправитель', max_length=settings.LEN_EMAIL)
+    to = models.EmailField('Получатель', max_length=settings.LEN_EMAIL)
+    status = models.CharField(
+        'Статус', max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    next_attempt = models.DateTimeField('Следующая попытка', default=now)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created = models.DateTimeField('Создано', auto_now_add=True)
+    sent = models.DateTimeField('Отправлено', null=True, blank=True)
+
+    class Meta:
+        ordering = ('-created',)
+        verbose_name = 'Письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [
+            models.Index(fields=('status', 'next_attempt'),
+                         name='outbox_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.to}: {self.subject}'
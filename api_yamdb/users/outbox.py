@@ -0,0 +1,105 @@
+"""Database-backed outbox for email.
+
+Requests only insert an ``OutboxEmail`` row; ``manage.py send_outbox``
+claims due messages in batches, sends them over one backend connection
+and reschedules failures with exponential backoff.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import OutboxEmail
+
+
+def enqueue_email(subject, body, to, from_email=None):
+    return OutboxEmail.objects.create(
+        subject=subject, body=body, to=to,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL)
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(
+        settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.EMAIL_OUTBOX_MAX_RETRY_DELAY))
+
+
+def claim_batch(size):
+    """Lease up to ``size`` due messages to this worker.
+
+    The lease moves ``next_attempt`` forward, so a worker that dies
+    mid-batch leaves the messages to be retried by another one.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        messages = list(OutboxEmail.objects.select_for_update(
+            skip_locked=True
+        ).filter(
+            status=OutboxEmail.PENDING, next_attempt__lte=now
+        ).order_by('next_attempt')[:size])
+        for message in messages:
+            message.attempts += 1
+            message.next_attempt = now + timedelta(
+                seconds=settings.EMAIL_OUTBOX_LEASE)
+        OutboxEmail.objects.bulk_update(
+            messages, ('attempts', 'next_attempt'))
+    return messages
+
+
+def mark_failed(message, error):
+    message.last_error = str(error)
+    if message.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        message.status = OutboxEmail.FAILED
+    else:
+        message.next_attempt = timezone.now() + retry_delay(message.attempts)
+
+
+def reopen(connection):
+    """Replace a connection that may have been dropped by the server."""
+    try:
+        connection.close()
+        connection.open()
+    except Exception:
+        # The backend opens a connection per message until it recovers.
+        pass
+
+
+def send_batch(messages, connection):
+    sent = []
+    for message in messages:
+        try:
+            EmailMessage(
+                message.subject, message.body, message.from_email,
+                [message.to], connection=connection
+            ).send()
+        except Exception as error:
+            mark_failed(message, error)
+            reopen(connection)
+            continue
+        message.status = OutboxEmail.SENT
+        message.sent = timezone.now()
+        message.last_error = ''
+        sent.append(message)
+    OutboxEmail.objects.bulk_update(
+        messages, ('status', 'next_attempt', 'last_error', 'sent'))
+    return sent
+
+
+def send_outbox(connection=None):
+    """Send every due message; return the numbers sent and failed."""
+    connection = connection or get_connection()
+    sent = failed = 0
+    # Raised before any message is claimed, so no attempt is spent.
+    connection.open()
+    try:
+        while True:
+            messages = claim_batch(settings.EMAIL_OUTBOX_BATCH_SIZE)
+            if not messages:
+                return sent, failed
+            done = len(send_batch(messages, connection))
+            sent += done
+            failed += len(messages) - done
+    finally:
+        connection.close()
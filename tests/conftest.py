@@ -1,9 +1,77 @@
 import sys
 from os.path import abspath, dirname, join
 
+import pytest
+from rest_framework.test import APIClient
+
+from reviews.models import Category, Comment, Review, Title
+from users.models import User
+
 root_dir = dirname(dirname(abspath(__file__)))
 sys.path.append(root_dir)
 infra_dir_path = join(root_dir, 'infra')
 
 pytest_plugins = [
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    from users.authentication import user_cache
+    cache.clear()
+    user_cache.clear()
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    """A cache shared by processes, which the response cache needs."""
+    settings.CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(tmp_path),
+    }}
+
+
+@pytest.fixture
+def author():
+    return User.objects.create(username='author', email='a@yamdb.fake')
+
+
+@pytest.fixture
+def admin():
+    return User.objects.create(username='admin', email='admin@yamdb.fake',
+                               role=User.ADMIN, is_staff=True,
+                               is_superuser=True)
+
+
+@pytest.fixture
+def admin_client(admin):
+    """Signed in to both the API and the Django admin site."""
+    client = APIClient()
+    client.force_authenticate(admin)
+    client.force_login(admin)
+    return client
+
+
+@pytest.fixture
+def category():
+    return Category.objects.create(name='Фильм', slug='movie')
+
+
+@pytest.fixture
+def title(category):
+    return Title.objects.create(name='Произведение', year=2000,
+                                category=category)
+
+
+@pytest.fixture
+def review(title, author):
+    return Review.objects.create(
+        title=title, author=author, text='Отзыв', score=5)
+
+
+@pytest.fixture
+def comment(review):
+    return Comment.objects.create(
+        review=review, author=review.author, text='Комментарий')
@@ -0,0 +1,110 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews import changelist
+from reviews.models import Category, Comment, Review, Title
+from users.models import User
+
+
+def create_rows(count):
+    category = Category.objects.get_or_create(name='Фильм', slug='movie')[0]
+    start = Title.objects.count()
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {number}', year=2000, category=category)
+        for number in range(start, count)
+    )
+    User.objects.bulk_create(
+        User(username=f'user{number}', email=f'user{number}@yamdb.fake')
+        for number in range(start, count)
+    )
+    authors = User.objects.filter(username__startswith='user').order_by('id')
+    titles = Title.objects.order_by('id')
+    Review.objects.bulk_create(
+        Review(title=title, author=author, text=f'Отзыв {title.id}', score=5)
+        for title, author in list(zip(titles, authors))[start:]
+    )
+    Comment.objects.bulk_create(
+        Comment(review=review, author=review.author, text='Комментарий')
+        for review in Review.objects.order_by('id')[start:]
+    )
+
+
+def changelist_queries(admin_client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.get(url)
+    assert response.status_code == 200
+    return len(context)
+
+
+@pytest.mark.django_db
+class TestAdminChangelist:
+
+    @pytest.mark.parametrize('url', [
+        '/admin/reviews/review/',
+        '/admin/reviews/comment/',
+        '/admin/users/user/',
+    ])
+    def test_queries_do_not_depend_on_rows(self, admin_client, url):
+        create_rows(5)
+        few = changelist_queries(admin_client, url)
+        create_rows(60)
+        assert changelist_queries(admin_client, url) == few, (
+            'Число запросов страницы админки не должно зависеть от '
+            'числа строк'
+        )
+
+    def test_input_filters_and_search(self, admin_client):
+        create_rows(30)
+        response = admin_client.get('/admin/reviews/comment/')
+        content = response.content.decode()
+        assert 'name="author"' in content
+        assert 'author__id__exact' not in content, (
+            'Фильтр по автору не должен выводить всех пользователей'
+        )
+        response = admin_client.get(
+            '/admin/reviews/review/', {'author': 'user3'})
+        assert response.context['cl'].result_count == 1
+        response = admin_client.get(
+            '/admin/reviews/review/', {'title_id': 'abc'})
+        assert response.context['cl'].result_count == 0
+        response = admin_client.get('/admin/users/user/', {'q': 'user1'})
+        assert response.context['cl'].result_count == 11
+        response = admin_client.get(
+            '/admin/users/user/', {'q': str(User.objects.get(
+                username='user7').pk)})
+        assert response.context['cl'].result_count == 1
+
+    def test_score_filter_has_fixed_choices(self, admin_client):
+        create_rows(5)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.get('/admin/reviews/review/')
+        assert not any(
+            'DISTINCT' in query['sql'] for query in context.captured_queries
+        ), 'Фильтр по оценке не должен читать все оценки из таблицы'
+        assert 'score=10' in response.content.decode()
+        response = admin_client.get('/admin/reviews/review/', {'score': 5})
+        assert response.context['cl'].result_count == 5
+        response = admin_client.get('/admin/reviews/review/', {'score': 4})
+        assert response.context['cl'].result_count == 0
+
+    def test_title_autocomplete(self, admin_client):
+        create_rows(3)
+        response = admin_client.get('/admin/autocomplete/', {
+            'app_label': 'reviews', 'model_name': 'review',
+            'field_name': 'title', 'term': 'Произведение',
+        })
+        assert response.status_code == 200
+        assert len(response.json()['results']) == 3
+
+    def test_estimated_count(self, monkeypatch, settings):
+        create_rows(3)
+        monkeypatch.setattr(changelist, 'estimate_count',
+                            lambda queryset: 10 ** 6)
+        paginator = changelist.EstimatedCountPaginator(
+            Review.objects.order_by('id'), 100)
+        assert paginator.count == 10 ** 6
+        settings.PAGINATION_ESTIMATE_THRESHOLD = 10 ** 7
+        paginator = changelist.EstimatedCountPaginator(
+            Review.objects.order_by('id'), 100)
+        assert paginator.count == 3
@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+import tracemalloc
+
+import pytest
+from django.contrib.admin.sites import site
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from import_export.formats.base_formats import CSV, JSON
+
+from reviews.models import Category, Review, Title
+from users.models import User
+
+URL = '/admin/reviews/review/export/'
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(settings):
+    settings.EXPORT_CHUNK_SIZE = 50
+
+
+def format_index(file_format):
+    formats = site._registry[Review].get_export_formats()
+    return str(formats.index(file_format))
+
+
+def create_reviews(count):
+    category = Category.objects.get_or_create(name='Фильм', slug='movie')[0]
+    start = Title.objects.count()
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {number}', year=2000, category=category)
+        for number in range(start, count)
+    )
+    start = User.objects.filter(username__startswith='user').count()
+    User.objects.bulk_create(
+        User(username=f'user{number}', email=f'user{number}@yamdb.fake')
+        for number in range(start, count)
+    )
+    authors = User.objects.filter(username__startswith='user').order_by('id')
+    existing = set(Review.objects.values_list('title_id', flat=True))
+    Review.objects.bulk_create(
+        Review(title=title, author=author, text='Текст ' * 20, score=5)
+        for title, author in zip(Title.objects.order_by('id'), authors)
+        if title.id not in existing
+    )
+
+
+def export_peak(admin_client, file_format=CSV):
+    tracemalloc.start()
+    response = admin_client.post(
+        URL, {'file_format': format_index(file_format)})
+    size = 0
+    for part in response.streaming_content:
+        size += len(part)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, size
+
+
+@pytest.mark.django_db
+class TestAdminExport:
+
+    def test_csv_export_is_streamed_with_joins(self, admin_client):
+        create_reviews(120)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                URL, {'file_format': format_index(CSV)})
+            assert response.streaming, 'Экспорт должен отдаваться потоком'
+            content = b''.join(response.streaming_content).decode()
+        rows = list(csv.reader(io.StringIO(content)))
+        assert sorted(rows[0]) == [
+            'author', 'id', 'pub_date', 'score', 'text', 'title_id']
+        assert len(rows) == 121
+        assert len(context) < 10, (
+            'Произведение и автор должны загружаться в том же запросе'
+        )
+
+    def test_json_export(self, admin_client):
+        create_reviews(3)
+        response = admin_client.post(
+            URL, {'file_format': format_index(JSON)})
+        data = json.loads(b''.join(response.streaming_content))
+        assert [row['score'] for row in data] == [5, 5, 5]
+
+    def test_memory_stays_flat(self, admin_client):
+        create_reviews(200)
+        small_peak, small_size = export_peak(admin_client)
+        create_reviews(2000)
+        large_peak, large_size = export_peak(admin_client)
+        assert large_size > small_size * 9
+        assert large_peak < small_peak * 2, (
+            'Пиковая память экспорта не должна расти вместе с числом строк'
+        )
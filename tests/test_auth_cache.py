@@ -0,0 +1,113 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from users.authentication import get_access_token, user_cache
+from users.checks import check_role_claim_cache
+from users.models import User
+
+
+def token_client(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {get_access_token(user)}')
+    return client
+
+
+def user_queries(context, user):
+    return [
+        query for query in context.captured_queries
+        if f'"users_user"."id" = {user.pk} ' in query['sql']
+    ]
+
+
+@pytest.fixture
+def user():
+    return User.objects.create(username='reader', email='reader@yamdb.fake')
+
+
+@pytest.fixture
+def admin():
+    return User.objects.create(username='boss', email='boss@yamdb.fake',
+                               role=User.ADMIN)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('shared_cache')
+class TestAuthenticatedUserCache:
+
+    def test_user_is_read_once(self, user):
+        client = token_client(user)
+        with CaptureQueriesContext(connection) as first:
+            assert client.get('/api/v1/titles/').status_code == 200
+        with CaptureQueriesContext(connection) as second:
+            assert client.get('/api/v1/titles/').status_code == 200
+        assert len(user_queries(first, user)) == 1
+        assert user_queries(second, user) == [], (
+            'Пользователь должен браться из кэша процесса'
+        )
+
+    def test_changes_invalidate_cache(self, user, admin):
+        client = token_client(user)
+        client.get('/api/v1/users/me/')
+        client.patch('/api/v1/users/me/', {'bio': 'Новая биография'})
+        assert client.get('/api/v1/users/me/').json()['bio'] == (
+            'Новая биография')
+        assert client.get('/api/v1/users/').status_code == 403
+        token_client(admin).patch(
+            f'/api/v1/users/{user.username}/', {'role': User.ADMIN})
+        assert client.get('/api/v1/users/').status_code == 200, (
+            'Смена роли должна сбрасывать кэш пользователя'
+        )
+        user.delete()
+        assert client.get('/api/v1/users/me/').status_code == 401
+
+    def test_cache_is_bounded(self, settings):
+        settings.AUTH_USER_CACHE_SIZE = 2
+        users = [
+            User.objects.create(username=f'user{number}',
+                                email=f'user{number}@yamdb.fake')
+            for number in range(3)
+        ]
+        for cached in users:
+            token_client(cached).get('/api/v1/users/me/')
+        assert list(user_cache.entries) == [users[1].pk, users[2].pk]
+
+    def test_role_claim(self, settings, admin):
+        settings.JWT_ROLE_CLAIM = True
+        client = token_client(admin)
+        with CaptureQueriesContext(connection) as context:
+            assert client.get('/api/v1/export/titles/').status_code == 200
+        assert user_queries(context, admin) == [], (
+            'Чтение с ролью в токене не должно обращаться к базе'
+        )
+        assert client.get('/api/v1/users/me/').json()['username'] == 'boss'
+        admin.role = User.USER
+        admin.save()
+        assert client.get('/api/v1/export/titles/').status_code == 403, (
+            'Роль из старого токена не должна действовать после изменения'
+        )
+
+
+@pytest.mark.django_db
+class TestProcessLocalCache:
+
+    def test_user_is_not_cached(self, user):
+        client = token_client(user)
+        client.get('/api/v1/titles/')
+        with CaptureQueriesContext(connection) as context:
+            assert client.get('/api/v1/titles/').status_code == 200
+        assert len(user_queries(context, user)) == 1, (
+            'Без общего кэша пользователь должен читаться из базы: '
+            'другие воркеры не узнают о его изменении'
+        )
+        assert not user_cache.entries
+
+    def test_role_claim_is_ignored(self, settings, admin):
+        settings.JWT_ROLE_CLAIM = True
+        client = token_client(admin)
+        with CaptureQueriesContext(connection) as context:
+            assert client.get('/api/v1/export/titles/').status_code == 200
+        assert len(user_queries(context, admin)) == 1
+        assert [error.id for error in check_role_claim_cache(None)] == [
+            'users.E001']
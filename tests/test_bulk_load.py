@@ -0,0 +1,100 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Genre, Review, Title
+from users.models import User
+
+
+@pytest.mark.django_db
+class TestBulkLoad:
+
+    def test_load_chain_and_rebuild_ratings(self, tmp_path):
+        files = {
+            'category.csv': 'id,name,slug\n1,Фильм,movie\n',
+            'genre.csv': 'id,name,slug\n1,Драма,drama\n',
+            'titles.csv': (
+                'id,name,year,category\n'
+                '1,"Первое, с запятой",2000,1\n'
+                '2,Второе,1990,movie\n'
+                '3,Без категории,1980,\n'
+                '4,Чужая категория,1970,99\n'
+            ),
+            'genre_title.ndjson': (
+                '{"id": 1, "title_id": 1, "genre_id": "drama"}\n'
+                '{"id": 2, "title_id": 5, "genre_id": 1}\n'
+            ),
+            'users.json': json.dumps([
+                {'id': 10, 'username': 'bingobongo',
+                 'email': 'bingobongo@yamdb.fake', 'role': 'user'},
+                {'id': 11, 'username': 'capt_obvious',
+                 'email': 'capt_obvious@yamdb.fake', 'role': 'admin'},
+            ]),
+            'review.csv': (
+                'id,title_id,text,author,score,pub_date\n'
+                '1,1,Хорошо,10,8,2019-09-24T21:08:21.567Z\n'
+                '2,1,Плохо,capt_obvious,3,2019-09-24T21:08:21.567Z\n'
+                '3,2,Нет автора,12,5,2019-09-24T21:08:21.567Z\n'
+            ),
+        }
+        for name, content in files.items():
+            (tmp_path / name).write_text(content, encoding='utf-8')
+        for model, name in (
+            ('category', 'category.csv'), ('genre', 'genre.csv'),
+            ('title', 'titles.csv'), ('genre_title', 'genre_title.ndjson'),
+            ('user', 'users.json'), ('review', 'review.csv'),
+        ):
+            call_command('bulk_load', model, str(tmp_path / name),
+                         chunk_size=1)
+
+        assert Category.objects.count() == 1
+        assert Genre.objects.count() == 1
+        assert list(Title.objects.order_by('id').values_list(
+            'id', 'name', 'category_id')) == [
+            (1, 'Первое, с запятой', 1), (2, 'Второе', 1),
+            (3, 'Без категории', None),
+        ], 'Строки с неизвестными связями должны пропускаться'
+        assert list(Title.objects.get(pk=1).genre.values_list(
+            'slug', flat=True)) == ['drama']
+        assert User.objects.get(pk=11).role == User.ADMIN
+        assert Review.objects.count() == 2
+        assert Review.objects.get(pk=1).pub_date.year == 2019, (
+            'Дата публикации должна браться из файла'
+        )
+        title = Title.objects.with_rating().get(pk=1)
+        assert (title.rating_sum, title.rating_count) == (11, 2), (
+            'После загрузки отзывов рейтинг должен быть пересчитан'
+        )
+        assert title.rating == 5.5
+
+        review = Review.objects.create(
+            title=Title.objects.get(pk=2), author=User.objects.get(pk=10),
+            text='Ещё', score=1
+        )
+        assert review.pk == 3, 'Последовательность id должна быть сброшена'
+
+    def test_numeric_username_does_not_shadow_id(self, tmp_path):
+        title = Title.objects.create(name='Произведение', year=2000)
+        by_id = User.objects.create(
+            username='reader', email='reader@yamdb.fake')
+        User.objects.create(
+            username=str(by_id.pk), email='digits@yamdb.fake')
+        path = tmp_path / 'review.ndjson'
+        path.write_text(
+            json.dumps({'title_id': title.pk, 'text': 'Отзыв',
+                        'author': str(by_id.pk), 'score': 7}) + '\n',
+            encoding='utf-8')
+        call_command('bulk_load', 'review', str(path))
+        assert Review.objects.get().author == by_id, (
+            'Числовое значение должно искаться среди id, '
+            'а не среди имён пользователей'
+        )
+
+    def test_rows_with_and_without_id(self, tmp_path):
+        path = tmp_path / 'category.csv'
+        path.write_text('id,name,slug\n5,Фильм,movie\n,Книга,book\n',
+                        encoding='utf-8')
+        call_command('bulk_load', 'category', str(path))
+        assert Category.objects.get(slug='movie').pk == 5
+        assert Category.objects.get(slug='book').pk != 5
@@ -0,0 +1,71 @@
+import pytest
+from django.db import connection
+from rest_framework.test import APIClient
+
+from reviews.models import Category, Genre, Title
+from users.models import User
+
+URL = '/api/v1/titles/bulk/'
+
+
+@pytest.fixture
+def slugs():
+    Category.objects.create(name='Фильм', slug='movie')
+    Genre.objects.create(name='Драма', slug='drama')
+    Genre.objects.create(name='Комедия', slug='comedy')
+
+
+@pytest.mark.django_db
+class TestBulkTitles:
+
+    def test_bulk_create_with_item_errors(self, admin_client, slugs):
+        payload = [
+            {'name': 'Первое', 'year': 2000, 'genre': ['drama', 'comedy'],
+             'category': 'movie'},
+            {'name': 'Без года', 'genre': [], 'category': 'movie'},
+            {'name': 'Чужой жанр', 'year': 2000, 'genre': ['horror'],
+             'category': 'movie'},
+            {'name': 'Второе', 'year': 1990, 'genre': ['drama', 'drama'],
+             'category': 'movie', 'description': 'Описание'},
+        ]
+        response = admin_client.post(URL, payload, format='json')
+        assert response.status_code == 201, response.json()
+        data = response.json()
+        assert [item['index'] for item in data['created']] == [0, 3]
+        assert [item['index'] for item in data['errors']] == [1, 2]
+        assert 'year' in data['errors'][0]['errors']
+        assert 'genre' in data['errors'][1]['errors']
+        first = Title.objects.get(pk=data['created'][0]['id'])
+        assert set(first.genre.values_list('slug', flat=True)) == {
+            'drama', 'comedy'}
+        assert first.category.slug == 'movie'
+        assert Title.objects.get(name='Второе').genre.count() == 1
+
+    def test_bulk_create_num_queries(self, admin_client, slugs,
+                                     django_assert_max_num_queries):
+        payload = [
+            {'name': f'Произведение {index}', 'year': 2000,
+             'genre': ['drama', 'comedy'], 'category': 'movie'}
+            for index in range(100)
+        ]
+        # Число запросов не зависит от размера пакета там, где bulk_create
+        # возвращает первичные ключи; иначе произведения сохраняются
+        # по одному, но жанры по-прежнему одним запросом.
+        max_queries = 10
+        if not connection.features.can_return_rows_from_bulk_insert:
+            max_queries += len(payload)
+        with django_assert_max_num_queries(max_queries):
+            response = admin_client.post(URL, payload, format='json')
+        assert response.status_code == 201
+        assert Title.genre.through.objects.count() == 200
+
+    def test_bulk_requires_admin(self, slugs):
+        user = User.objects.create(username='user', email='user@yamdb.fake')
+        client = APIClient()
+        assert client.post(URL, [], format='json').status_code == 401
+        client.force_authenticate(user)
+        assert client.post(URL, [], format='json').status_code == 403
+
+    def test_all_items_invalid(self, admin_client):
+        response = admin_client.post(URL, [{'name': 'x'}], format='json')
+        assert response.status_code == 400
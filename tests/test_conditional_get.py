@@ -0,0 +1,136 @@
+from types import SimpleNamespace
+
+import pytest
+
+from api import cache
+from reviews.models import Comment, Title
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    """The clock of version tokens, moved forward by hand."""
+    now = [10 ** 9]
+
+    def tick(seconds=2):
+        now[0] += seconds
+
+    monkeypatch.setattr(cache, 'time', SimpleNamespace(time=lambda: now[0]))
+    return tick
+
+
+def assert_not_modified(client, url, django_assert_num_queries, queries,
+                        last_modified=True):
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.has_header('ETag')
+    assert response.has_header('Last-Modified') == last_modified
+    with django_assert_num_queries(queries):
+        response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == 304, (
+        f'Проверьте, что {url} отвечает 304 на повторный запрос с ETag'
+    )
+    return response['ETag']
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('shared_cache')
+class TestConditionalGet:
+
+    def test_title_detail(self, client, review, django_assert_num_queries):
+        url = f'/api/v1/titles/{review.title_id}/'
+        etag = assert_not_modified(
+            client, url, django_assert_num_queries, 2, last_modified=False)
+        Title.objects.filter(pk=review.title_id).update(year=2001)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'ETag произведения должен меняться при любом изменении записи'
+        )
+        assert response.json()['year'] == 2001
+
+    def test_title_list(self, client, review, django_assert_num_queries,
+                        clock):
+        # The first request creates the missing version tokens.
+        client.get('/api/v1/titles/')
+        clock()
+        assert_not_modified(
+            client, '/api/v1/titles/', django_assert_num_queries, 0)
+
+    def test_reviews_change_with_review_edit(self, client, review,
+                                             django_assert_num_queries,
+                                             clock):
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+        clock()
+        etag = assert_not_modified(
+            client, url, django_assert_num_queries, 0)
+        review.text = 'Новый текст'
+        review.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()['results'][0]['text'] == 'Новый текст'
+
+    def test_comments(self, client, review, django_assert_num_queries,
+                      clock):
+        url = f'/api/v1/titles/{review.title_id}/reviews/{review.pk}/comments/'
+        Comment.objects.create(review=review, author=review.author, text='К')
+        clock()
+        etag = assert_not_modified(client, url, django_assert_num_queries, 0)
+        Comment.objects.create(review=review, author=review.author, text='Е')
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    @pytest.mark.parametrize('change', ('edit', 'delete_older'))
+    def test_if_modified_since_after_comment_change(self, client, review,
+                                                    clock, change):
+        url = f'/api/v1/titles/{review.title_id}/reviews/{review.pk}/comments/'
+        older = Comment.objects.create(
+            review=review, author=review.author, text='Первый')
+        newer = Comment.objects.create(
+            review=review, author=review.author, text='Второй')
+        clock()
+        last_modified = client.get(url)['Last-Modified']
+        assert client.get(
+            url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 304
+        clock()
+        if change == 'edit':
+            newer.text = 'Исправлено'
+            newer.save()
+        else:
+            older.delete()
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 200, (
+            'Изменение или удаление комментария должно менять Last-Modified'
+        )
+
+    def test_if_modified_since_after_genre_rename(self, client, review,
+                                                  clock):
+        genre = review.title.genre.create(name='Драма', slug='drama')
+        client.get('/api/v1/titles/')
+        clock()
+        last_modified = client.get('/api/v1/titles/')['Last-Modified']
+        clock()
+        genre.name = 'Трагедия'
+        genre.save()
+        response = client.get(
+            '/api/v1/titles/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 200
+        assert response.json()['results'][0]['genre'][0]['name'] == 'Трагедия'
+
+    def test_no_last_modified_in_bump_second(self, client, review):
+        response = client.get(f'/api/v1/titles/{review.title_id}/reviews/')
+        assert response.has_header('ETag')
+        assert not response.has_header('Last-Modified'), (
+            'Last-Modified не должен совпадать с текущей секундой'
+        )
+
+
+@pytest.mark.django_db
+class TestProcessLocalValidators:
+
+    def test_no_validators_without_shared_cache(self, client, review):
+        response = client.get(
+            f'/api/v1/titles/{review.title_id}/reviews/')
+        assert response.status_code == 200
+        assert not response.has_header('ETag'), (
+            'Без общего кэша версии не меняются в других воркерах, '
+            'ETag и Last-Modified отдавать нельзя'
+        )
+        assert not response.has_header('Last-Modified')
@@ -0,0 +1,107 @@
+import threading
+
+import pytest
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+from api import connections as connections_module
+from api.connections import ConnectionLimitMiddleware, iter_by_pk
+from reviews.models import Category
+
+
+def open_connection(request=None):
+    connection.ensure_connection()
+    return HttpResponse()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConnectionReuse:
+
+    @pytest.mark.parametrize('idle, closed', ((0, 1), (60, 0)))
+    def test_idle_connection_is_checked(self, settings, monkeypatch, idle,
+                                        closed):
+        settings.DB_HEALTH_CHECK_IDLE = idle
+        open_connection()
+        request_finished.send(sender=None)
+        closes = []
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        monkeypatch.setattr(connection, 'close', lambda: closes.append(1))
+        request_started.send(sender=None)
+        assert len(closes) == closed, (
+            'Разорванное соединение, простоявшее дольше '
+            'DB_HEALTH_CHECK_IDLE, нужно закрыть до начала запроса'
+        )
+
+    def test_connections_kept_per_worker(self, settings, monkeypatch):
+        settings.DB_MAX_CONNECTIONS = 1
+        closes = []
+        monkeypatch.setattr(connections_module, 'close_connections',
+                            lambda: closes.append(threading.get_ident()))
+        middleware = ConnectionLimitMiddleware(open_connection)
+        middleware(RequestFactory().get('/'))
+        middleware(RequestFactory().get('/'))
+        assert closes == []
+        thread = threading.Thread(
+            target=lambda: middleware(RequestFactory().get('/')))
+        thread.start()
+        thread.join()
+        assert closes == [thread.ident], (
+            'Сверх лимита соединения не должны оставаться открытыми'
+        )
+
+    def test_busy_worker_answers_503(self, settings):
+        settings.DB_MAX_CONNECTIONS = 1
+        settings.DB_CONNECTION_WAIT = 0.01
+        release = threading.Event()
+        responses = []
+
+        def slow(request):
+            release.wait()
+            return HttpResponse()
+
+        middleware = ConnectionLimitMiddleware(slow)
+        thread = threading.Thread(target=lambda: responses.append(
+            middleware(RequestFactory().get('/'))))
+        thread.start()
+        assert middleware(RequestFactory().get('/')).status_code == 503
+        release.set()
+        thread.join()
+        assert responses[0].status_code == 200
+
+    def test_streaming_response_holds_slot(self, settings):
+        settings.DB_MAX_CONNECTIONS = 1
+        settings.DB_CONNECTION_WAIT = 0.01
+        middleware = ConnectionLimitMiddleware(
+            lambda request: StreamingHttpResponse(iter(['a', 'b'])))
+        response = middleware(RequestFactory().get('/'))
+        assert middleware(RequestFactory().get('/')).status_code == 503, (
+            'Слот занят, пока потоковый ответ читает базу и отправляется'
+        )
+        assert b''.join(response.streaming_content) == b'ab'
+        response.close()
+        assert middleware(RequestFactory().get('/')).status_code == 200
+
+
+@pytest.mark.django_db
+class TestPoolerMode:
+
+    @pytest.mark.parametrize('disabled', (False, True))
+    def test_iter_by_pk(self, monkeypatch, django_assert_num_queries,
+                        disabled):
+        Category.objects.bulk_create(
+            Category(name=f'Категория {number}', slug=f'category-{number}')
+            for number in range(7)
+        )
+        monkeypatch.setitem(
+            connection.settings_dict, 'DISABLE_SERVER_SIDE_CURSORS', disabled)
+        expected = list(Category.objects.order_by('pk').values_list('slug'))
+        queries = 4 if disabled else 1
+        with django_assert_num_queries(queries):
+            rows = list(iter_by_pk(
+                Category.objects.values_list('id', 'slug'), 3))
+        assert [row[1:] for row in rows] == expected
+        with django_assert_num_queries(queries):
+            rows = list(iter_by_pk(Category.objects.values('id', 'slug'), 3))
+        assert [(row['slug'],) for row in rows] == expected
@@ -0,0 +1,108 @@
+import csv
+import io
+import json
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from reviews.models import Comment, Genre, Review, Title
+from users.models import User
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(settings):
+    settings.EXPORT_CHUNK_SIZE = 2
+
+
+@pytest.fixture
+def dataset(category, author):
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    titles = []
+    for number in range(5):
+        title = Title.objects.create(
+            name=f'Произведение "{number}", часть 1', year=2000,
+            category=category)
+        title.genre.add(genre)
+        titles.append(title)
+    review = Review.objects.create(
+        title=titles[0], author=author, text='Текст\nв две строки', score=7)
+    Comment.objects.create(review=review, author=author, text='Коммент')
+    return titles
+
+
+def read(response):
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestExport:
+
+    def test_only_admin(self, client, dataset):
+        user = User.objects.create(username='user', email='u@yamdb.fake')
+        user_client = APIClient()
+        user_client.force_authenticate(user)
+        assert client.get('/api/v1/export/titles/').status_code == 401
+        assert user_client.get('/api/v1/export/titles/').status_code == 403
+
+    def test_titles_ndjson(self, admin_client, dataset):
+        response = admin_client.get('/api/v1/export/titles/')
+        assert response.status_code == 200
+        assert response.streaming, 'Выгрузка должна отдаваться потоком'
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        rows = [json.loads(line) for line in read(response).splitlines()]
+        assert [row['id'] for row in rows] == [
+            title.id for title in dataset]
+        assert rows[0] == {
+            'id': dataset[0].id, 'name': 'Произведение "0", часть 1',
+            'year': 2000, 'description': None, 'category': 'movie',
+            'genre': ['drama'], 'rating': 7.0,
+        }
+
+    def test_reviews_csv(self, admin_client, dataset):
+        response = admin_client.get('/api/v1/export/reviews/?output=csv')
+        assert response['Content-Type'].startswith('text/csv')
+        rows = list(csv.reader(io.StringIO(read(response))))
+        assert rows[0] == [
+            'id', 'title_id', 'author', 'text', 'score', 'pub_date']
+        assert rows[1][1:5] == [
+            str(dataset[0].id), 'author', 'Текст\nв две строки', '7']
+        assert rows[1][5].endswith('Z')
+
+    def test_filters(self, admin_client, dataset):
+        Title.objects.filter(pk=dataset[0].pk).update(
+            modified=timezone.now() - timedelta(days=10))
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        response = admin_client.get(
+            '/api/v1/export/titles/',
+            {'updated_since': since, 'after_id': dataset[1].id})
+        ids = [json.loads(line)['id']
+               for line in read(response).splitlines()]
+        assert ids == [title.id for title in dataset[2:]]
+        response = admin_client.get(
+            '/api/v1/export/comments/', {'updated_since': 'вчера'})
+        assert response.status_code == 400
+        response = admin_client.get(
+            '/api/v1/export/comments/', {'output': 'xml'})
+        assert response.status_code == 400
+
+    def test_edited_reviews_are_updated(self, admin_client, dataset):
+        old = timezone.now() - timedelta(days=10)
+        Review.objects.update(pub_date=old, modified=old)
+        Comment.objects.update(pub_date=old, modified=old)
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        for resource in ('reviews', 'comments'):
+            response = admin_client.get(
+                f'/api/v1/export/{resource}/', {'updated_since': since})
+            assert read(response) == ''
+        review = Review.objects.get()
+        review.score = 2
+        review.save()
+        response = admin_client.get(
+            '/api/v1/export/reviews/', {'updated_since': since})
+        rows = [json.loads(line) for line in read(response).splitlines()]
+        assert [row['score'] for row in rows] == [2], (
+            'Проверьте, что updated_since включает изменённые отзывы, '
+            'а не только созданные'
+        )
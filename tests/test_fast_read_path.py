@@ -0,0 +1,64 @@
+import pytest
+from django.test import override_settings
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+
+@pytest.fixture
+def catalog():
+    category = Category.objects.create(name='Фильм', slug='movie')
+    drama = Genre.objects.create(name='Драма', slug='drama')
+    comedy = Genre.objects.create(name='Комедия', slug='comedy')
+    title = Title.objects.create(
+        name='Произведение', year=2000, category=category,
+        description='Описание')
+    title.genre.set((comedy, drama))
+    Title.objects.create(name='Без категории', year=1999)
+    for index in range(3):
+        author = User.objects.create(
+            username=f'user{index}', email=f'user{index}@yamdb.fake')
+        review = Review.objects.create(
+            title=title, author=author, text=f'Отзыв {index}',
+            score=index + 3)
+        Comment.objects.create(review=review, author=author, text='К')
+    return title, review
+
+
+def get_both(client, url):
+    with override_settings(API_FAST_READ_PATH=False, API_CACHE_ENABLED=False):
+        regular = client.get(url)
+    with override_settings(API_FAST_READ_PATH=True, API_CACHE_ENABLED=False):
+        fast = client.get(url)
+    assert regular.status_code == fast.status_code == 200
+    return regular.content, fast.content
+
+
+@pytest.mark.django_db
+class TestFastReadPath:
+
+    @pytest.mark.parametrize('query', (
+        '', '?limit=1&offset=1', '?cursor=&ordering=rating', '?genre=drama',
+        '?search=произведение',
+    ))
+    def test_titles_parity(self, client, catalog, query):
+        regular, fast = get_both(client, f'/api/v1/titles/{query}')
+        assert regular == fast, (
+            'Проверьте, что быстрый путь отдаёт тот же ответ, '
+            'что и TitleSerializer'
+        )
+
+    @pytest.mark.parametrize('query', ('', '?page=1', '?cursor=&limit=2'))
+    def test_reviews_parity(self, client, catalog, query):
+        title, _ = catalog
+        regular, fast = get_both(
+            client, f'/api/v1/titles/{title.pk}/reviews/{query}')
+        assert regular == fast
+
+    def test_comments_parity(self, client, catalog):
+        title, review = catalog
+        regular, fast = get_both(
+            client,
+            f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/'
+        )
+        assert regular == fast
@@ -0,0 +1,106 @@
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from tablib import Dataset
+
+from reviews.admin import ReviewResource
+from reviews.models import Category, ImportJob, Review, Title
+from users.models import User
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+@pytest.fixture
+def titles():
+    category = Category.objects.create(name='Фильм', slug='movie')
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {number}', year=2000, category=category)
+        for number in range(20)
+    )
+    return list(Title.objects.order_by('id'))
+
+
+@pytest.fixture
+def authors():
+    User.objects.bulk_create(
+        User(username=f'user{number}', email=f'user{number}@yamdb.fake')
+        for number in range(10)
+    )
+    return list(User.objects.order_by('id'))
+
+
+def count_queries(context):
+    # Savepoints around every row come from import-export itself.
+    return sum(
+        not query['sql'].startswith(('SAVEPOINT', 'RELEASE SAVEPOINT'))
+        for query in context.captured_queries
+    )
+
+
+def review_rows(titles, authors):
+    return [
+        (title.id, 'Текст', author.id, (number % 10) + 1,
+         '2019-09-24T21:08:21.567Z')
+        for number, (title, author) in enumerate(
+            (title, author) for title in titles for author in authors)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBulkImport:
+
+    def test_queries_do_not_grow_with_rows(self, titles, authors):
+        headers = ('title_id', 'text', 'author', 'score', 'pub_date')
+        small = Dataset(*review_rows(titles[:1], authors), headers=headers)
+        large = Dataset(*review_rows(titles[1:], authors), headers=headers)
+        resource = ReviewResource()
+        with CaptureQueriesContext(connection) as small_queries:
+            result = resource.import_data(small)
+        assert not result.has_errors()
+        with CaptureQueriesContext(connection) as large_queries:
+            result = resource.import_data(large)
+        assert not result.has_errors()
+        assert count_queries(large_queries) <= count_queries(
+            small_queries) + 2, (
+            'Число запросов при импорте не должно зависеть от числа строк'
+        )
+        assert Review.objects.count() == 200
+        assert Review.objects.filter(pub_date__year=2019).count() == 200, (
+            'Дата публикации должна браться из файла'
+        )
+        title = Title.objects.get(pk=titles[0].pk)
+        assert (title.rating_sum, title.rating_count) == (55, 10), (
+            'После импорта рейтинг должен быть пересчитан'
+        )
+
+    def test_missing_relations_are_reported(self, titles, authors):
+        dataset = Dataset(
+            (titles[0].id, 'Текст', authors[0].id, 5, ''),
+            (0, 'Нет произведения', authors[1].id, 5, ''),
+            headers=('title_id', 'text', 'author', 'score', 'pub_date'))
+        result = ReviewResource().import_data(dataset)
+        assert result.has_validation_errors()
+        assert [row.number for row in result.invalid_rows] == [2]
+        review = Review.objects.get()
+        assert review.author == authors[0]
+        assert review.pub_date is not None
+
+    def test_import_job(self, settings, titles, authors):
+        settings.IMPORT_CHUNK_SIZE = 7
+        dataset = Dataset(*review_rows(titles[:2], authors),
+                          headers=('title_id', 'text', 'author', 'score',
+                                   'pub_date'))
+        dataset.append((0, 'Нет произведения', authors[0].id, 5, ''))
+        job = ImportJob(resource='review', input_format='csv')
+        job.file.save('reviews.csv', ContentFile(dataset.export('csv')))
+        call_command('process_imports', once=True)
+        job.refresh_from_db()
+        assert job.status == ImportJob.FAILED
+        assert (job.processed_rows, job.total_rows) == (21, 21)
+        assert job.errors.startswith('Строка 21:')
+        assert Review.objects.count() == 20
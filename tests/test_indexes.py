@@ -0,0 +1,47 @@
+import pytest
+from django.db import connection
+
+from reviews.models import Comment, Review, Title
+
+
+def explain(queryset):
+    if connection.vendor != 'postgresql':
+        return queryset.explain()
+    # На маленьких тестовых таблицах планировщик предпочтёт seq scan.
+    with connection.cursor() as cursor:
+        cursor.execute('SET enable_seqscan = off')
+        try:
+            return queryset.explain()
+        finally:
+            # Настройка сессии пережила бы тест и изменила планы
+            # запросов в следующих тестах.
+            cursor.execute('RESET enable_seqscan')
+
+
+@pytest.mark.django_db
+class TestAccessPathIndexes:
+
+    def test_reviews_by_title(self, review):
+        plan = explain(Review.objects.filter(title_id=review.title_id))
+        assert 'review_title_pub_date_idx' in plan, (
+            'Проверьте, что отзывы произведения читаются по индексу '
+            f'(title_id, pub_date DESC, id DESC):\n{plan}'
+        )
+
+    def test_comments_by_review(self, review):
+        plan = explain(Comment.objects.filter(
+            review_id=review.pk).order_by('pub_date', 'id'))
+        assert 'comment_review_pub_date_idx' in plan, plan
+
+    def test_titles_by_category(self, review):
+        plan = explain(Title.objects.filter(
+            category_id=review.title.category_id).order_by('id'))
+        # В SQLite любой индекс по category_id уже упорядочен по rowid,
+        # поэтому проверяем отсутствие отдельной сортировки.
+        assert 'INDEX' in plan.upper(), plan
+        assert 'TEMP B-TREE' not in plan and 'Sort' not in plan, plan
+
+    def test_titles_by_genre(self, review):
+        plan = explain(Title.genre.through.objects.filter(
+            genre_id=1).values('title_id'))
+        assert 'reviews_title_genre_genre_title_idx' in plan, plan
@@ -0,0 +1,51 @@
+import pytest
+from rest_framework.test import APIClient
+
+from reviews.models import Review, Title
+
+
+@pytest.fixture
+def author_client(author):
+    client = APIClient()
+    client.force_authenticate(author)
+    return client
+
+
+@pytest.mark.django_db
+class TestNestedWrites:
+
+    def test_create_review_num_queries(self, author_client, title,
+                                       django_assert_num_queries):
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        # Произведение, вставка отзыва, обновление рейтинга
+        # и точки сохранения транзакции.
+        with django_assert_num_queries(5):
+            response = author_client.post(url, {'text': 'Отзыв', 'score': 7})
+        assert response.status_code == 201, response.json()
+
+    def test_second_review_rejected(self, author_client, author, title):
+        Review.objects.create(
+            title=title, author=author, text='Отзыв', score=7)
+        response = author_client.post(
+            f'/api/v1/titles/{title.pk}/reviews/',
+            {'text': 'Ещё отзыв', 'score': 1}
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что второй отзыв на произведение не создаётся'
+        )
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (7, 1)
+
+    def test_comment_review_must_belong_to_title(self, author_client,
+                                                 author, title):
+        review = Review.objects.create(
+            title=title, author=author, text='Отзыв', score=7)
+        other = Title.objects.create(name='Другое', year=2000)
+        response = author_client.get(
+            f'/api/v1/titles/{other.pk}/reviews/{review.pk}/comments/')
+        assert response.status_code == 404
+        response = author_client.post(
+            f'/api/v1/titles/{other.pk}/reviews/{review.pk}/comments/',
+            {'text': 'Комментарий'}
+        )
+        assert response.status_code == 404
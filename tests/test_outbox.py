@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from users.models import OutboxEmail
+from users.outbox import enqueue_email, send_outbox
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return super().open()
+
+
+class FailingBackend(EmailBackend):
+
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+@pytest.mark.django_db
+class TestOutbox:
+
+    def test_sign_up_only_enqueues(self, client):
+        response = client.post('/api/v1/auth/signup/', {
+            'username': 'newbie', 'email': 'newbie@yamdb.fake'})
+        assert response.status_code == 200
+        assert mail.outbox == [], (
+            'Регистрация не должна отправлять письмо в запросе'
+        )
+        message = OutboxEmail.objects.get()
+        assert message.to == 'newbie@yamdb.fake'
+        assert message.status == OutboxEmail.PENDING
+        call_command('send_outbox', '--once')
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == ['newbie@yamdb.fake']
+        assert 'Код подтверждения' in mail.outbox[0].body
+        message.refresh_from_db()
+        assert message.status == OutboxEmail.SENT
+
+    def test_batch_uses_one_connection(self, settings):
+        settings.EMAIL_BACKEND = f'{__name__}.CountingBackend'
+        settings.EMAIL_OUTBOX_BATCH_SIZE = 3
+        CountingBackend.opened = 0
+        for number in range(7):
+            enqueue_email('Тема', 'Текст', f'user{number}@yamdb.fake')
+        assert send_outbox() == (7, 0)
+        assert len(mail.outbox) == 7
+        assert CountingBackend.opened == 1, (
+            'Пакет писем должен отправляться через одно соединение'
+        )
+        assert send_outbox() == (0, 0)
+
+    def test_retry_with_backoff(self, settings):
+        settings.EMAIL_BACKEND = f'{__name__}.FailingBackend'
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        message = enqueue_email('Тема', 'Текст', 'user@yamdb.fake')
+        assert send_outbox() == (0, 1)
+        message.refresh_from_db()
+        assert message.status == OutboxEmail.PENDING
+        assert message.attempts == 1
+        assert 'SMTP недоступен' in message.last_error
+        assert message.next_attempt > timezone.now() + timedelta(
+            seconds=settings.EMAIL_OUTBOX_RETRY_DELAY - 5)
+        assert send_outbox() == (0, 0), (
+            'Письмо не должно отправляться раньше следующей попытки'
+        )
+        OutboxEmail.objects.update(next_attempt=timezone.now())
+        assert send_outbox() == (0, 1)
+        message.refresh_from_db()
+        assert message.status == OutboxEmail.FAILED
+        assert message.attempts == 2
@@ -0,0 +1,137 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api import pagination
+from reviews.models import Review, Title
+from users.models import User
+
+
+@pytest.fixture
+def title_with_reviews():
+    title = Title.objects.create(name='Произведение', year=2000)
+    for index in range(7):
+        author = User.objects.create(
+            username=f'user{index}', email=f'user{index}@yamdb.fake')
+        Review.objects.create(
+            title=title, author=author, text=f'Отзыв {index}', score=5)
+    return title
+
+
+def collect_pages(client, url):
+    ids = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        data = response.json()
+        assert 'count' not in data
+        ids.extend(item['id'] for item in data['results'])
+        url = data['next']
+    return ids
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+
+    def test_reviews_cursor_mode(self, client, title_with_reviews):
+        url = f'/api/v1/titles/{title_with_reviews.pk}/reviews/'
+        ids = collect_pages(client, f'{url}?cursor=&limit=3')
+        expected = list(Review.objects.order_by(
+            '-pub_date', '-id').values_list('id', flat=True))
+        assert ids == expected, (
+            'Проверьте, что в режиме cursor отзывы отдаются '
+            'по (pub_date, id) без пропусков и повторов'
+        )
+
+    def test_reviews_default_pagination_kept(self, client,
+                                             title_with_reviews):
+        url = f'/api/v1/titles/{title_with_reviews.pk}/reviews/'
+        data = client.get(url).json()
+        assert data['count'] == 7
+        assert len(data['results']) == 5
+
+    def test_titles_cursor_by_rating(self, client, title_with_reviews):
+        unrated = Title.objects.create(name='Без отзывов', year=2001)
+        ids = collect_pages(client, '/api/v1/titles/?cursor=&ordering=rating'
+                                    '&limit=1')
+        assert ids == [title_with_reviews.pk, unrated.pk]
+
+    def test_titles_cursor_by_rating_with_ties(self, client):
+        author = User.objects.create(
+            username='critic', email='critic@yamdb.fake')
+        titles = []
+        for index in range(7):
+            title = Title.objects.create(name=f'Произведение {index}',
+                                         year=2000)
+            if index % 3:
+                Review.objects.create(title=title, author=author,
+                                      text='Отзыв', score=index % 3 + 5)
+            titles.append(title)
+        expected = list(Title.objects.order_by(
+            '-rating_key', 'id').values_list('id', flat=True))
+        url = '/api/v1/titles/?cursor=&ordering=rating&limit=2'
+        ids = collect_pages(client, url)
+        assert ids == expected, (
+            'Проверьте, что курсор по рейтингу хранит рейтинг и id '
+            'и проходит равные рейтинги без пропусков и повторов'
+        )
+        second = client.get(client.get(url).json()['next']).json()
+        previous = client.get(second['previous']).json()
+        assert [item['id'] for item in previous['results']] == expected[:2]
+
+    def test_rating_key_follows_reviews(self, title_with_reviews):
+        review = title_with_reviews.reviews.first()
+        review.score = 1
+        review.save()
+        title_with_reviews.refresh_from_db()
+        assert title_with_reviews.rating_key == pytest.approx(31 / 7)
+        Review.objects.filter(title=title_with_reviews).delete()
+        Title.objects.recalculate_rating()
+        title_with_reviews.refresh_from_db()
+        assert title_with_reviews.rating_key == 0
+
+
+@pytest.mark.django_db
+class TestCheapCount:
+
+    def test_reviews_count_from_counter(self, client, title_with_reviews):
+        url = f'/api/v1/titles/{title_with_reviews.pk}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            data = client.get(url).json()
+        assert not any(
+            'COUNT(' in query['sql'] for query in context.captured_queries
+        ), 'Проверьте, что количество отзывов берётся из счётчика'
+        assert data['count'] == 7
+        assert data['count_exact'] is True
+
+    def test_comments_count_cached(self, client, title_with_reviews):
+        review = title_with_reviews.reviews.first()
+        url = (f'/api/v1/titles/{title_with_reviews.pk}/reviews/'
+               f'{review.pk}/comments/')
+        first = client.get(url).json()
+        # Past the response cache, to the paginator.
+        second = client.get(url, HTTP_CACHE_CONTROL='no-cache').json()
+        assert (first['count'], first['count_exact']) == (0, True)
+        assert (second['count'], second['count_exact']) == (0, False), (
+            'Проверьте, что повторный запрос берёт количество из кэша'
+        )
+
+    def test_low_estimate_does_not_end_pages(self, client, monkeypatch,
+                                             settings):
+        settings.PAGINATION_ESTIMATE_THRESHOLD = 0
+        monkeypatch.setattr(pagination, 'estimate_count', lambda queryset: 1)
+        ids = [Title.objects.create(name=f'Произведение {index}',
+                                    year=2000).pk for index in range(5)]
+        url = '/api/v1/titles/?limit=2'
+        seen = []
+        while url:
+            data = client.get(url).json()
+            assert (data['count'], data['count_exact']) == (1, False)
+            seen.extend(item['id'] for item in data['results'])
+            url = data['next']
+        assert sorted(seen) == ids, (
+            'Проверьте, что ссылка next не зависит от оценки количества'
+        )
+        data = client.get('/api/v1/titles/?limit=2&offset=4').json()
+        assert len(data['results']) == 1
+        assert data['next'] is None
@@ -0,0 +1,65 @@
+import pytest
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from api.permissions import (AdminModeratorAuthorPermission,
+                             ReviewsCommentsPermission)
+from reviews.models import Comment, Review
+from users.models import User
+
+
+def make_request(user, method='patch'):
+    request = Request(getattr(APIRequestFactory(), method)('/'))
+    request.user = user
+    return request
+
+
+@pytest.mark.django_db
+class TestObjectPermissions:
+
+    @pytest.mark.parametrize('model, permission', [
+        (Review, ReviewsCommentsPermission()),
+        (Comment, AdminModeratorAuthorPermission()),
+    ])
+    @pytest.mark.usefixtures('comment')
+    def test_author_is_not_loaded(self, django_assert_num_queries, model,
+                                  permission, author):
+        obj = model.objects.get()
+        other = User.objects.create(username='other', email='o@yamdb.fake')
+        moderator = User.objects.create(
+            username='moderator', email='m@yamdb.fake', role=User.MODERATOR)
+        with django_assert_num_queries(0):
+            assert permission.has_object_permission(
+                make_request(author), None, obj)
+            assert not permission.has_object_permission(
+                make_request(other), None, obj)
+            assert permission.has_object_permission(
+                make_request(moderator), None, obj)
+            assert permission.has_object_permission(
+                make_request(other, 'get'), None, obj)
+
+    def test_roles_are_computed_once(self):
+        user = User(username='admin', role=User.ADMIN)
+        request = make_request(user)
+        permission = AdminModeratorAuthorPermission()
+        obj = Comment(author_id=0)
+        assert permission.has_object_permission(request, None, obj)
+        user.role = User.USER
+        assert permission.has_object_permission(request, None, obj), (
+            'Роль пользователя вычисляется один раз за запрос'
+        )
+
+    @pytest.mark.usefixtures('comment')
+    def test_delete_by_author_and_stranger(self, title, review):
+        url = f'/api/v1/titles/{title.pk}/reviews/{review.pk}/'
+        client = APIClient()
+        client.force_authenticate(
+            User.objects.create(username='other', email='o@yamdb.fake'))
+        assert client.delete(url).status_code == 403
+        client.force_authenticate(review.author)
+        comment = review.comments.get()
+        assert client.delete(
+            f'{url}comments/{comment.pk}/').status_code == 204
+        assert client.delete(url).status_code == 204
+        title.refresh_from_db()
+        assert title.rating_count == 0
@@ -0,0 +1,96 @@
+import pytest
+
+from reviews.models import Review, Title
+from users.models import User
+
+
+@pytest.fixture
+def authors():
+    return [
+        User.objects.create(username=f'user{index}',
+                            email=f'user{index}@yamdb.fake')
+        for index in range(3)
+    ]
+
+
+def get_counters(title):
+    title.refresh_from_db()
+    return title.rating_sum, title.rating_count, title.rating_key
+
+
+@pytest.mark.django_db
+class TestRatingCounters:
+
+    def test_review_create(self, title, authors):
+        Review.objects.create(title=title, author=authors[0], text='1',
+                              score=4)
+        Review.objects.create(title=title, author=authors[1], text='2',
+                              score=7)
+        assert get_counters(title) == (11, 2, 5.5), (
+            'Проверьте, что создание отзыва увеличивает счётчики рейтинга'
+        )
+
+    def test_review_rescore(self, title, authors):
+        review = Review.objects.create(title=title, author=authors[0],
+                                       text='1', score=4)
+        review.score = 9
+        review.save()
+        assert get_counters(title) == (9, 1, 9.0), (
+            'Проверьте, что изменение оценки меняет сумму, '
+            'но не количество отзывов'
+        )
+
+    def test_review_moved_to_other_title(self, title, authors):
+        other = Title.objects.create(name='Другое', year=2001)
+        review = Review.objects.create(title=title, author=authors[0],
+                                       text='1', score=4)
+        review.title = other
+        review.save()
+        assert get_counters(title) == (0, 0, 0.0)
+        assert get_counters(other) == (4, 1, 4.0)
+
+    def test_review_delete(self, title, authors):
+        for author, score in zip(authors, (2, 4, 9)):
+            Review.objects.create(title=title, author=author, text='1',
+                                  score=score)
+        title.reviews.get(score=9).delete()
+        assert get_counters(title) == (6, 2, 3.0)
+        title.reviews.all().delete()
+        assert get_counters(title) == (0, 0, 0.0), (
+            'Проверьте, что удаление отзывов уменьшает счётчики рейтинга'
+        )
+
+    def test_author_delete_cascades(self, title, authors):
+        other = Title.objects.create(name='Другое', year=2001)
+        for target in (title, other):
+            Review.objects.create(title=target, author=authors[0],
+                                  text='1', score=8)
+        Review.objects.create(title=title, author=authors[1], text='2',
+                              score=2)
+        authors[0].delete()
+        assert get_counters(title) == (2, 1, 2.0), (
+            'Проверьте, что удаление автора обновляет рейтинг '
+            'произведений с его отзывами'
+        )
+        assert get_counters(other) == (0, 0, 0.0)
+
+    def test_title_delete_cascades(self, title, authors):
+        other = Title.objects.create(name='Другое', year=2001)
+        Review.objects.create(title=title, author=authors[0], text='1',
+                              score=8)
+        Review.objects.create(title=other, author=authors[0], text='2',
+                              score=3)
+        title.delete()
+        assert not Review.objects.filter(title_id=title.pk).exists()
+        assert get_counters(other) == (3, 1, 3.0)
+
+    def test_title_save_keeps_counters(self, title, authors):
+        stale = Title.objects.get(pk=title.pk)
+        Review.objects.create(title=title, author=authors[0], text='1',
+                              score=6)
+        stale.name = 'Новое название'
+        stale.save()
+        assert get_counters(title) == (6, 1, 6.0), (
+            'Проверьте, что сохранение произведения не перезаписывает '
+            'счётчики рейтинга устаревшими значениями'
+        )
@@ -0,0 +1,85 @@
+import datetime
+import decimal
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.renderers import FastJSONRenderer
+from reviews.models import Comment, Genre, Review, Title
+
+
+@pytest.fixture
+def catalog(admin, category):
+    admin.bio = 'Строка\u2028с «юникодом»'
+    admin.save()
+    genre = Genre.objects.create(name='Драма "в кавычках"', slug='drama')
+    title = Title.objects.create(name='Произведение', year=2000,
+                                 category=category, description='Ёж\u2029')
+    title.genre.set((genre,))
+    review = Review.objects.create(title=title, author=admin, text='</>\\',
+                                   score=7)
+    Comment.objects.create(review=review, author=admin, text='\tКомментарий')
+    return title, review
+
+
+def render_both(data, media_type=None):
+    return (JSONRenderer().render(data, media_type),
+            FastJSONRenderer().render(data, media_type))
+
+
+@pytest.mark.django_db
+class TestFastJSONRenderer:
+
+    def test_endpoints_byte_for_byte(self, admin_client, catalog):
+        client = admin_client
+        title, review = catalog
+        urls = (
+            '/api/v1/categories/', '/api/v1/genres/', '/api/v1/titles/',
+            f'/api/v1/titles/{title.pk}/',
+            f'/api/v1/titles/{title.pk}/reviews/',
+            f'/api/v1/titles/{title.pk}/reviews/{review.pk}/',
+            f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/',
+            '/api/v1/users/', '/api/v1/users/me/',
+        )
+        for url in urls:
+            response = client.get(url)
+            assert response.status_code == 200, url
+            regular, fast = render_both(response.data)
+            assert regular == fast, (
+                f'Проверьте, что {url} рендерится так же, как JSONRenderer'
+            )
+            assert response.content == regular
+
+    def test_special_types(self):
+        data = {
+            'datetime': timezone.now(),
+            'naive': datetime.datetime(2020, 1, 2, 3, 4, 5, 678901),
+            'date': datetime.date(2020, 1, 2),
+            'time': datetime.time(3, 4, 5),
+            'lazy': gettext_lazy('Ленивая строка'),
+            'decimal': decimal.Decimal('7.50'),
+            'float': 7.666666666666667,
+            'separators': '\u2028\u2029',
+            'nested': [{'set': {1}}, (1, 2), None, True],
+        }
+        regular, fast = render_both(data)
+        assert regular == fast
+
+    @pytest.mark.parametrize('data', (
+        {1: 'не строковый ключ'},
+        {'big': 2 ** 70},
+    ))
+    def test_fallback_to_stdlib(self, data):
+        regular, fast = render_both(data)
+        assert regular == fast
+
+    def test_indent_and_missing_orjson(self, monkeypatch):
+        data = {'key': ['значение']}
+        regular, fast = render_both(data, 'application/json; indent=4')
+        assert regular == fast
+        monkeypatch.setattr(renderers, 'orjson', None)
+        regular, fast = render_both(data)
+        assert regular == fast
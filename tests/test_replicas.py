@@ -0,0 +1,101 @@
+from collections import Counter
+
+import pytest
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from api import replicas
+from reviews.models import Title
+
+router = replicas.ReplicaRouter()
+
+
+@pytest.fixture(autouse=True)
+def replica_settings(settings, monkeypatch):
+    settings.DATABASE_REPLICAS = {'replica1': 2, 'replica2': 1}
+    replicas.balancer.current.clear()
+    replicas.health.clear()
+    lags = {'replica1': 0, 'replica2': 0}
+    monkeypatch.setattr(replicas, 'replica_lag', lags.get)
+    return lags
+
+
+def read_alias(write=False):
+    def get_response(request):
+        if write:
+            router.db_for_write(Title)
+        return HttpResponse(router.db_for_read(Title))
+    return get_response
+
+
+def call(method='get', path='/api/v1/titles/', write=False, cookies=None):
+    request = getattr(RequestFactory(), method)(path)
+    request.COOKIES.update(cookies or {})
+    return replicas.ReplicaMiddleware(read_alias(write))(request)
+
+
+def aliases(count, **kwargs):
+    return Counter(
+        call(**kwargs).content.decode() for _ in range(count))
+
+
+class TestReplicaRouting:
+
+    def test_weighted_round_robin(self):
+        assert aliases(6) == {'replica1': 4, 'replica2': 2}
+        assert [call().content.decode() for _ in range(3)] == [
+            'replica1', 'replica2', 'replica1'], (
+            'Реплики должны чередоваться, а не выбираться подряд'
+        )
+
+    def test_primary_outside_safe_api_requests(self):
+        assert aliases(3, method='post') == {'default': 3}
+        assert aliases(3, path='/admin/reviews/review/') == {'default': 3}
+        assert router.db_for_read(Title) == 'default', (
+            'Вне запроса чтение должно идти в основную базу'
+        )
+
+    def test_reads_after_write_are_pinned(self):
+        response = call(write=True)
+        assert response.content.decode() == 'default'
+        cookie = response.cookies[replicas.PIN_COOKIE]
+        assert call(
+            cookies={replicas.PIN_COOKIE: cookie.value}
+        ).content.decode() == 'default', (
+            'После записи клиент должен читать из основной базы'
+        )
+        assert call(
+            cookies={replicas.PIN_COOKIE: 'abc'}).content.decode() != 'default'
+        assert replicas.PIN_COOKIE not in call().cookies
+
+    @pytest.mark.django_db
+    def test_reads_in_transaction_use_primary(self):
+        def get_response(request):
+            with transaction.atomic():
+                return HttpResponse(router.db_for_read(Title))
+
+        response = replicas.ReplicaMiddleware(get_response)(
+            RequestFactory().get('/api/v1/titles/'))
+        assert response.content.decode() == 'default'
+
+    def test_lagging_replica_is_skipped(self, replica_settings, settings):
+        replica_settings['replica1'] = settings.REPLICA_MAX_LAG + 1
+        assert aliases(4) == {'replica2': 4}
+        replica_settings['replica2'] = None
+        replicas.health.clear()
+        assert aliases(2) == {'default': 2}, (
+            'Без доступных реплик чтение должно идти в основную базу'
+        )
+
+    def test_health_is_rechecked(self, replica_settings, settings,
+                                 monkeypatch):
+        replica_settings['replica1'] = None
+        assert aliases(2) == {'replica2': 2}
+        replica_settings['replica1'] = 0
+        assert aliases(2) == {'replica2': 2}
+        later = replicas.time.monotonic() + settings.REPLICA_CHECK_INTERVAL
+        monkeypatch.setattr(replicas.time, 'monotonic', lambda: later + 1)
+        assert 'replica1' in aliases(3), (
+            'Состояние реплики должно перепроверяться'
+        )
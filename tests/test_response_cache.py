@@ -0,0 +1,133 @@
+import time
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory
+from rest_framework.response import Response
+
+from api import replicas
+from api.cache import CachedResponseMixin
+from api.checks import check_response_cache
+from reviews.models import Category, Review, Title
+from users.models import User
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('shared_cache')
+class TestResponseCache:
+
+    def test_categories_cached_and_invalidated(self, client,
+                                               django_assert_num_queries):
+        Category.objects.create(name='Фильм', slug='movie')
+        assert client.get('/api/v1/categories/')['X-Cache'] == 'MISS'
+        with django_assert_num_queries(0):
+            response = client.get('/api/v1/categories/')
+        assert response['X-Cache'] == 'HIT'
+        assert response.json()['count'] == 1
+        Category.objects.create(name='Книга', slug='book')
+        response = client.get('/api/v1/categories/')
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 2, (
+            'Проверьте, что запись сбрасывает кэш ответов'
+        )
+
+    def test_title_invalidated_by_review_and_genre(self, client, title,
+                                                   author):
+        url = '/api/v1/titles/'
+
+        def first_title():
+            return client.get(url).json()['results'][0]
+
+        assert first_title()['rating'] is None
+        Review.objects.create(title=title, author=author, text='О', score=8)
+        assert first_title()['rating'] == 8
+        genre = title.genre.create(name='Драма', slug='drama')
+        assert first_title()['genre'] == [
+            {'name': genre.name, 'slug': genre.slug}]
+        Title.objects.update(rating_sum=0, rating_count=0)
+        call_command('recalculate_ratings')
+        assert client.get(url)['X-Cache'] == 'MISS'
+
+    def test_no_cache_header_bypasses_lookup(self, client):
+        client.get('/api/v1/genres/')
+        response = client.get('/api/v1/genres/', HTTP_CACHE_CONTROL='no-cache')
+        assert response['X-Cache'] == 'MISS'
+
+    def test_api_write_invalidates(self, admin_client):
+        client = admin_client
+        client.get('/api/v1/genres/')
+        client.post('/api/v1/genres/', {'name': 'Драма', 'slug': 'drama'})
+        response = client.get('/api/v1/genres/')
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 1
+
+    def test_user_saves_invalidate_only_on_rename(self, client, review):
+        author = review.author
+        url = f'/api/v1/titles/{review.title_id}/reviews/'
+        client.get(url)
+        author.bio = 'Биография'
+        author.save()
+        User.objects.get(pk=author.pk).save(update_fields=('last_login',))
+        assert client.get(url)['X-Cache'] == 'HIT', (
+            'Изменение пользователя без смены имени не должно '
+            'сбрасывать кэш отзывов'
+        )
+        author = User.objects.only('id').get(pk=author.pk)
+        author.username = 'writer'
+        author.save()
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['results'][0]['author'] == 'writer'
+
+    def test_sign_up_does_not_invalidate(self, client, title):
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        client.get(url)
+        client.post('/api/v1/auth/signup/', {
+            'username': 'newbie', 'email': 'newbie@yamdb.fake'})
+        assert client.get(url)['X-Cache'] == 'HIT'
+
+
+@pytest.mark.django_db
+class TestProcessLocalResponseCache:
+
+    def test_responses_are_not_stored(self, client):
+        Category.objects.create(name='Фильм', slug='movie')
+        client.get('/api/v1/categories/')
+        response = client.get('/api/v1/categories/')
+        assert 'X-Cache' not in response, (
+            'С кэшем в памяти процесса ответы не должны кэшироваться: '
+            'другие воркеры не узнают о записи'
+        )
+        assert [warning.id for warning in check_response_cache(None)] == [
+            'api.W001']
+
+
+@pytest.mark.usefixtures('shared_cache')
+class TestReplicaResponseCache:
+
+    def get_stored(self, request, data):
+        return CachedResponseMixin().get_stored_response(
+            lambda request: Response(data), request, 'api-response:key')
+
+    def test_replica_response_is_not_stored(self, monkeypatch):
+        monkeypatch.setattr(replicas.state, 'replica', 'replica1',
+                            raising=False)
+        monkeypatch.setattr(replicas.state, 'pinned', False, raising=False)
+        request = RequestFactory().get('/api/v1/genres/')
+        assert self.get_stored(request, {'count': 1})['X-Cache'] == 'MISS'
+        assert cache.get('api-response:key') is None, (
+            'Ответ, собранный на реплике, не должен попадать в кэш: '
+            'реплика может отставать от версии'
+        )
+
+    def test_pinned_client_skips_lookup(self, settings):
+        settings.DATABASE_REPLICAS = {'replica1': 1}
+        cache.set('api-response:key', {'count': 0})
+        request = RequestFactory().get('/api/v1/genres/')
+        request.COOKIES[replicas.PIN_COOKIE] = str(time.time() + 60)
+        response = self.get_stored(request, {'count': 1})
+        assert response.data == {'count': 1}, (
+            'Клиент после своей записи должен видеть её, а не запись кэша'
+        )
+        assert cache.get('api-response:key') == {'count': 1}
@@ -0,0 +1,65 @@
+import pytest
+from rest_framework.test import APIClient
+
+from reviews.models import Comment, Review
+from users.models import User
+
+
+def create_reviews(title, count):
+    users = [
+        User.objects.create(username=f'user{index}',
+                            email=f'user{index}@yamdb.fake')
+        for index in range(count)
+    ]
+    reviews = [
+        Review.objects.create(title=title, author=user, text='Отзыв', score=5)
+        for user in users
+    ]
+    Comment.objects.bulk_create(
+        Comment(review=reviews[0], author=user, text='Комментарий')
+        for user in users
+    )
+    return reviews[0]
+
+
+@pytest.mark.django_db
+class TestReviewCommentQueries:
+
+    @pytest.mark.parametrize('count', (5, 20))
+    def test_review_list_num_queries(self, client, django_assert_num_queries,
+                                     title, count):
+        create_reviews(title, count)
+        # Произведение и страница отзывов вместе с авторами.
+        with django_assert_num_queries(2):
+            response = client.get(
+                f'/api/v1/titles/{title.pk}/reviews/?cursor=&limit={count}')
+        results = response.json()['results']
+        assert len(results) == count
+        assert {item['author'] for item in results} == {
+            f'user{index}' for index in range(count)}
+
+    @pytest.mark.parametrize('count', (5, 20))
+    def test_comment_list_num_queries(self, client,
+                                      django_assert_num_queries, title,
+                                      count):
+        review = create_reviews(title, count)
+        # Отзыв, COUNT и страница комментариев вместе с авторами.
+        with django_assert_num_queries(3):
+            response = client.get(
+                f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/'
+                f'?limit={count}'
+            )
+        results = response.json()['results']
+        assert len(results) == count
+        assert results[0]['author'].startswith('user')
+
+    def test_review_update_keeps_pruned_columns(self, title):
+        review = create_reviews(title, 1)
+        client = APIClient()
+        client.force_authenticate(review.author)
+        response = client.patch(
+            f'/api/v1/titles/{title.pk}/reviews/{review.pk}/', {'score': 9})
+        assert response.status_code == 200, response.json()
+        assert response.json()['author'] == review.author.username
+        title.refresh_from_db()
+        assert title.rating_sum == 9
@@ -0,0 +1,67 @@
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db
+class TestTitleSearch:
+
+    def test_search_ranked_by_name_and_description(self, client):
+        in_description = Title.objects.create(
+            name='Мастер', year=1967, description='Роман про Воланда')
+        in_name = Title.objects.create(name='Воланд и свита', year=2000)
+        Title.objects.create(name='Война и мир', year=1869)
+        response = client.get('/api/v1/titles/?search=воланд')
+        assert response.status_code == 200
+        ids = [item['id'] for item in response.json()['results']]
+        assert ids == [in_name.pk, in_description.pk], (
+            'Проверьте, что поиск идёт по названию и описанию, '
+            'а совпадения в названии выше'
+        )
+
+    def test_search_index_follows_changes(self, client):
+        title = Title.objects.create(name='Старое название', year=2000)
+        title.name = 'Новое название'
+        title.save()
+        assert not client.get(
+            '/api/v1/titles/?search=старое').json()['results']
+        assert client.get('/api/v1/titles/?search=нов').json()['count'] == 1
+        title.delete()
+        assert not client.get('/api/v1/titles/?search=нов').json()['results']
+
+
+@pytest.mark.django_db
+class TestTitleFilter:
+
+    @pytest.fixture
+    def titles(self):
+        category = Category.objects.create(name='Книга', slug='book')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        old = Title.objects.create(name='Старое', year=1990, category=category)
+        old.genre.set((drama, comedy))
+        new = Title.objects.create(name='Новое', year=2020)
+        new.genre.set((comedy,))
+        return old, new
+
+    @pytest.mark.parametrize('query, expected', (
+        ('year=1990', [0]),
+        ('year=199', []),
+        ('year__icontains=199', [0]),
+        ('year__gte=2000', [1]),
+        ('year__lte=2020&year__gte=1990', [0, 1]),
+        ('genre=comedy', [0, 1]),
+        ('genre=drama,comedy', [0, 1]),
+        ('genre=dram', []),
+        ('genre__icontains=dram', [0]),
+        ('genre=unknown', []),
+        ('category=book', [0]),
+        ('category=bo', []),
+        ('category__icontains=bo', [0]),
+    ))
+    def test_filters(self, client, titles, query, expected):
+        response = client.get(f'/api/v1/titles/?{query}')
+        assert response.status_code == 200
+        assert [item['id'] for item in response.json()['results']] == [
+            titles[index].pk for index in expected
+        ]
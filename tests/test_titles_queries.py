@@ -0,0 +1,51 @@
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+
+def create_titles(count):
+    category = Category.objects.create(name='Фильм', slug='movie')
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {index}', slug=f'genre-{index}')
+        for index in range(3)
+    )
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {index}', year=2000, category=category)
+        for index in range(count)
+    )
+    # На SQLite bulk_create не возвращает первичные ключи.
+    genres = Genre.objects.all()
+    titles = Title.objects.all()
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(title_id=title.pk, genre_id=genre.pk)
+        for title in titles
+        for genre in genres
+    )
+
+
+@pytest.mark.django_db
+class TestTitleListQueries:
+
+    @pytest.mark.parametrize('page_size', (5, 50, 500))
+    def test_title_list_num_queries(self, client, django_assert_num_queries,
+                                    page_size):
+        create_titles(page_size)
+        # COUNT для пагинации, страница произведений, жанры страницы.
+        with django_assert_num_queries(3):
+            response = client.get(f'/api/v1/titles/?limit={page_size}')
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert len(results) == page_size, (
+            'Проверьте, что эндпойнт `/api/v1/titles/` возвращает всю страницу'
+        )
+        assert results[0]['category'] == {'name': 'Фильм', 'slug': 'movie'}
+        assert len(results[0]['genre']) == 3
+
+    def test_title_detail_num_queries(self, client,
+                                      django_assert_num_queries):
+        create_titles(1)
+        title = Title.objects.get()
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/{title.pk}/')
+        assert response.status_code == 200
+        assert response.json()['rating'] is None
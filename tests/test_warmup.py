@@ -0,0 +1,16 @@
+import pytest
+from django.db import connection
+
+from api_yamdb.warmup import warm_up_app, warm_up_worker
+
+
+@pytest.mark.django_db
+class TestWarmup:
+
+    def test_app_warmup_does_not_connect(self, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            warm_up_app()
+
+    def test_worker_warmup_connects(self):
+        warm_up_worker()
+        assert connection.connection is not None